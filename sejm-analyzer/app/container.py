@@ -26,11 +26,11 @@ class Container:
         if self._initialized:
             return
 
-        # Repositories (singletons)
+        # Repositories (singletons) - the writable one first, so the shared DB handle opens read-write
+        self._cache_repo = CacheRepository(read_only=False)
         self._mp_repo = MpRepository()
         self._voting_repo = VotingRepository()
         self._process_repo = ProcessRepository()
-        self._cache_repo = CacheRepository(read_only=False)
 
         # Services (with injected repos)
         self.voting_analytics = VotingAnalytics(
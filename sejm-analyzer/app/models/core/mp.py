@@ -12,7 +12,3 @@ CREATE TABLE IF NOT EXISTS mp (
     active BOOLEAN
 )
 """
-
-MP_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_mp_term ON mp(term_id)",
-]
@@ -19,5 +19,5 @@ CREATE TABLE IF NOT EXISTS process (
 
 PROCESS_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_process_term ON process(term_id)",
-    "CREATE INDEX IF NOT EXISTS idx_process_passed ON process(passed)",
+    "CREATE INDEX IF NOT EXISTS idx_process_term_passed ON process(term_id, passed)",
 ]
@@ -17,4 +17,5 @@ CREATE TABLE IF NOT EXISTS process_stage (
 PROCESS_STAGE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_stage_process ON process_stage(process_id)",
     "CREATE INDEX IF NOT EXISTS idx_stage_voting ON process_stage(voting_id)",
+    "CREATE INDEX IF NOT EXISTS idx_stage_process_date ON process_stage(process_id, date)",
 ]
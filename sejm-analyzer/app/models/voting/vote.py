@@ -9,9 +9,3 @@ CREATE TABLE IF NOT EXISTS vote (
     vote VARCHAR
 )
 """
-
-VOTE_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_vote_voting ON vote(voting_id)",
-    "CREATE INDEX IF NOT EXISTS idx_vote_mp ON vote(mp_id)",
-    "CREATE INDEX IF NOT EXISTS idx_vote_club ON vote(club)",
-]
@@ -16,7 +16,3 @@ CREATE TABLE IF NOT EXISTS voting (
     not_voting INTEGER
 )
 """
-
-VOTING_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_voting_term ON voting(term_id)",
-]
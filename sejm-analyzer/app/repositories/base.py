@@ -1,8 +1,13 @@
 """Base repository class."""
 
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from typing import Any
 
+import duckdb
+import orjson
+import pyarrow as pa
 from loguru import logger
 
 from app.repositories.db import get_db, reconnect_db
@@ -11,10 +16,18 @@ from app.repositories.db import get_db, reconnect_db
 class BaseRepository:
     """Base repository with common functionality."""
 
+    # In-memory query cache: LRU-bounded, entries expire so data refreshed by ETL shows up
+    CACHE_MAXSIZE = 64
+    CACHE_TTL = 3600.0
+    # Key prefix for query results persisted in analytics_cache (kept apart from analytics keys)
+    PERSIST_PREFIX = "repo:"
+    # Source table -> prefixes of the in-memory cache keys derived from it ("<prefix><term_id>[_...]")
+    CACHE_TABLES: dict[str, tuple[str, ...]] = {}
+
     def __init__(self, read_only: bool = True):
-        self._db = get_db(read_only)
         self._read_only = read_only
-        self._cache: dict[str, Any] = {}
+        get_db(read_only)  # connect eagerly
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
         logger.debug("{} initialized", self.__class__.__name__)
 
     def clear_cache(self) -> None:
@@ -22,18 +35,90 @@ class BaseRepository:
         self._cache.clear()
         logger.debug("Cache cleared")
 
+    def invalidate(self, table: str, term_id: int | None = None) -> None:
+        """Drop in-memory results derived from a table (only one term's if given), keeping the rest.
+
+        Keys without a term part (e.g. "terms_with_data") span all terms and are always dropped.
+        """
+        stale = []
+        for key in self._cache:
+            for prefix in self.CACHE_TABLES.get(table, ()):
+                rest = key[len(prefix) :]
+                if key.startswith(prefix) and (term_id is None or not rest or rest.split("_")[0] == str(term_id)):
+                    stale.append(key)
+                    break
+        for key in stale:
+            del self._cache[key]
+        logger.debug("Invalidated {} cache entries for {} (term {})", len(stale), table, term_id)
+
+    @property
+    def _db(self) -> duckdb.DuckDBPyConnection:
+        """Calling thread's cursor - repositories are shared singletons, DuckDB cursors are not thread-safe."""
+        return get_db(self._read_only)
+
     def refresh(self) -> None:
         """Reconnect to database and clear cache."""
-        self._db = reconnect_db(self._read_only)
+        reconnect_db(self._read_only)
         self.clear_cache()
         logger.info("Repository refreshed")
 
     def _cached(self, key: str, fn: Callable[[], Any]) -> Any:
         """Get from cache or compute."""
-        if key not in self._cache:
-            self._cache[key] = fn()
-            logger.debug("Cache miss: {}", key)
-        return self._cache[key]
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            self._cache.move_to_end(key)
+            return entry[1]
+
+        value = fn()
+        logger.debug("Cache miss: {}", key)
+        self._cache[key] = (now + self.CACHE_TTL, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
+        return value
+
+    def _persisted(self, term_id: int, key: str, fn: Callable[[], Any]) -> Any:
+        """Like `_cached`, backed by the analytics_cache table so results survive restarts.
+
+        Only writable repositories store new results; values must be JSON-serializable.
+        """
+
+        def load():
+            db_key = self.PERSIST_PREFIX + key
+            value = self._load_json(term_id, db_key)
+            if value is None:
+                value = fn()
+                if not self._read_only:
+                    self._store_json(term_id, db_key, value)
+            return value
+
+        return self._cached(key, load)
+
+    def _load_json(self, term_id: int, key: str) -> Any:
+        """Read a JSON payload from analytics_cache (None if missing)."""
+        row = self.fetchone("SELECT data FROM analytics_cache WHERE term_id = ? AND key = ?", [term_id, key])
+        return orjson.loads(row[0]) if row else None
+
+    def _store_json(self, term_id: int, key: str, value: Any) -> None:
+        """Write a JSON payload to analytics_cache."""
+        self._store_json_many(term_id, {key: value})
+
+    def _store_json_many(self, term_id: int, items: dict[str, Any]) -> None:
+        """Write several JSON payloads for a term in one transaction (one statement, many rows)."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        rows = [[term_id, key, orjson.dumps(value, option=option).decode()] for key, value in items.items()]
+        self.execute("BEGIN TRANSACTION")
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO analytics_cache (term_id, key, data, computed_at) "
+                "VALUES (?, ?, ?, now() AT TIME ZONE 'UTC')",
+                rows,
+            )
+            self.execute("COMMIT")
+        except Exception:
+            self.execute("ROLLBACK")
+            raise
 
     def execute(self, query: str, params: list | None = None) -> Any:
         """Execute SQL query."""
@@ -48,3 +133,11 @@ class BaseRepository:
     def fetchone(self, query: str, params: list | None = None) -> Any:
         """Execute and fetch one row."""
         return self.execute(query, params).fetchone()
+
+    def fetch_numpy(self, query: str, params: list | None = None) -> dict[str, Any]:
+        """Execute and fetch the result as {column: NumPy array}."""
+        return self.execute(query, params).fetchnumpy()
+
+    def fetch_arrow(self, query: str, params: list | None = None) -> pa.Table:
+        """Execute and fetch the result as a columnar Arrow table."""
+        return self.execute(query, params).fetch_arrow_table()
@@ -1,8 +1,8 @@
 """Cache repository - analytics cache storage."""
 
-import json
-from datetime import datetime
+from typing import Any
 
+import orjson
 from loguru import logger
 
 from app.repositories.base import BaseRepository
@@ -11,32 +11,55 @@ from app.repositories.base import BaseRepository
 class CacheRepository(BaseRepository):
     """Repository for analytics cache operations."""
 
+    CACHE_TABLES = {"analytics_cache": ("analytics_",)}
+
     def get(self, term_id: int, key: str) -> dict | None:
         """Load cached analytics from DB."""
-        row = self.fetchone(
-            "SELECT data FROM analytics_cache WHERE term_id = ? AND key = ?",
-            [term_id, key],
-        )
-        if row:
+        data = self.get_all(term_id).get(key)
+        if data is not None:
             logger.debug("Cache hit: term={}, key={}", term_id, key)
-            return json.loads(row[0])
-        return None
+        return data
+
+    def get_all(self, term_id: int) -> dict[str, Any]:
+        """All cached analytics of a term: {key: data}, read in one query on first use."""
+
+        def fetch():
+            rows = self.fetchall(
+                "SELECT key, data FROM analytics_cache WHERE term_id = ? AND NOT starts_with(key, ?)",
+                [term_id, self.PERSIST_PREFIX],
+            )
+            return {key: orjson.loads(data) for key, data in rows}
+
+        return self._cached(self._term_key(term_id), fetch)
+
+    def _term_key(self, term_id: int) -> str:
+        """In-memory cache key of a term's analytics."""
+        return f"analytics_{term_id}"
+
+    def _remember(self, term_id: int, items: dict[str, Any]) -> None:
+        """Apply written items to the term's in-memory analytics, if loaded."""
+        entry = self._cache.get(self._term_key(term_id))
+        if entry is not None:
+            entry[1].update(items)
 
     def set(self, term_id: int, key: str, data: dict) -> None:
         """Save analytics to cache."""
         if self._read_only:
             raise RuntimeError("Cannot write cache in read-only mode")
 
-        json_data = json.dumps(data)
-        self.execute(
-            """
-            INSERT OR REPLACE INTO analytics_cache (term_id, key, data, computed_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            [term_id, key, json_data, datetime.utcnow()],
-        )
+        self._store_json(term_id, key, data)
+        self._remember(term_id, {key: data})
         logger.debug("Cache saved: term={}, key={}", term_id, key)
 
+    def set_many(self, term_id: int, items: dict[str, Any]) -> None:
+        """Save several analytics for a term in one batch."""
+        if self._read_only:
+            raise RuntimeError("Cannot write cache in read-only mode")
+
+        self._store_json_many(term_id, items)
+        self._remember(term_id, items)
+        logger.debug("Cache saved: term={}, keys={}", term_id, list(items))
+
     def clear(self, term_id: int | None = None) -> None:
         """Clear cache for a term or all."""
         if self._read_only:
@@ -44,15 +67,25 @@ class CacheRepository(BaseRepository):
 
         if term_id:
             self.execute("DELETE FROM analytics_cache WHERE term_id = ?", [term_id])
+            self.invalidate("analytics_cache", term_id)
             logger.info("Cache cleared for term {}", term_id)
         else:
             self.execute("DELETE FROM analytics_cache")
+            self.invalidate("analytics_cache")
             logger.info("All cache cleared")
 
     def exists(self, term_id: int) -> bool:
-        """Check if term has cached analytics."""
+        """Check if term has cached analytics (persisted repository results don't count)."""
         row = self.fetchone(
-            "SELECT COUNT(*) FROM analytics_cache WHERE term_id = ?",
-            [term_id],
+            "SELECT COUNT(*) FROM analytics_cache WHERE term_id = ? AND NOT starts_with(key, ?)",
+            [term_id, self.PERSIST_PREFIX],
         )
         return row[0] > 0
+
+    def cached_terms(self) -> list[int]:
+        """Terms that have cached analytics, in one query (persisted repository results don't count)."""
+        rows = self.fetchall(
+            "SELECT DISTINCT term_id FROM analytics_cache WHERE NOT starts_with(key, ?) ORDER BY term_id",
+            [self.PERSIST_PREFIX],
+        )
+        return [r[0] for r in rows]
@@ -10,26 +10,38 @@ class MpRepository(BaseRepository):
 
     def get_terms(self) -> list[int]:
         """Get available terms with data."""
-        rows = self.fetchall("SELECT DISTINCT term_id FROM mp ORDER BY term_id DESC")
-        return [r[0] for r in rows]
+        cols = self.fetch_numpy("SELECT DISTINCT term_id FROM mp ORDER BY term_id DESC")
+        return cols["term_id"].tolist()
 
     def get_parties(self, term_id: int) -> dict[str, int]:
         """Get party seats: {party: count}."""
 
         def fetch():
-            rows = self.fetchall(
+            cols = self.fetch_numpy(
                 """
-                SELECT club, COUNT(*) FROM mp
+                SELECT club, COUNT(*) as seats FROM mp
                 WHERE term_id = ? AND club IS NOT NULL
                 GROUP BY club
                 """,
                 [term_id],
             )
-            result = {r[0]: int(r[1]) for r in rows}
+            result = dict(zip(cols["club"].tolist(), cols["seats"].tolist()))
             logger.debug("get_parties({}): {} parties", term_id, len(result))
             return result
 
-        return self._cached(f"parties_{term_id}", fetch)
+        return self._persisted(term_id, f"parties_{term_id}", fetch)
+
+    def get_parties_summary(self, term_id: int) -> tuple[int, int]:
+        """Get (parties count, total seats) without building the per-party breakdown."""
+
+        def fetch():
+            parties, seats = self.fetchone(
+                "SELECT COUNT(DISTINCT club), COUNT(*) FROM mp WHERE term_id = ? AND club IS NOT NULL",
+                [term_id],
+            )
+            return parties, seats
+
+        return self._cached(f"seats_{term_id}", fetch)
 
     def get_terms_with_data(self) -> dict[str, set[int]]:
         """Get sets of terms that have voting and process data."""
@@ -1,6 +1,7 @@
 """DuckDB connection management."""
 
 import threading
+import weakref
 from pathlib import Path
 
 import duckdb
@@ -10,6 +11,13 @@ from app.models import ALL_DDL
 from settings import DB_PATH
 
 _local = threading.local()
+_bootstrap_lock = threading.Lock()
+_bootstrapped = False
+_shared_lock = threading.Lock()
+_shared: duckdb.DuckDBPyConnection | None = None
+_shared_read_only = True
+# Cursors handed out on the shared handle (entries vanish when a finished thread's cursors are collected)
+_cursors: weakref.WeakSet = weakref.WeakSet()
 
 
 def db_exists() -> bool:
@@ -37,29 +45,75 @@ def init_tables(conn: duckdb.DuckDBPyConnection) -> None:
 
 
 def _ensure_db_exists() -> None:
-    """Create DB with tables if it doesn't exist."""
-    if not db_exists():
-        logger.warning("DB not found: {}. Creating empty DB.", DB_PATH)
-        conn = duckdb.connect(DB_PATH)
-        init_tables(conn)
-        conn.close()
+    """Create DB with tables if it doesn't exist (checked once per process)."""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if _bootstrapped:
+            return
+        if not db_exists():
+            logger.warning("DB not found: {}. Creating empty DB.", DB_PATH)
+            conn = duckdb.connect(DB_PATH)
+            init_tables(conn)
+            conn.close()
+        _bootstrapped = True
+
+
+def _shared_db(read_only: bool) -> duckdb.DuckDBPyConnection:
+    """Process-wide database handle, opened in the mode of the first caller.
+
+    DuckDB can't hold read-only and read-write connections to one file in the same process, and
+    closing the handle kills every cursor on it. A read-only handle is therefore only reopened
+    read-write while no thread holds a cursor; processes that write create their writable
+    repositories first.
+    """
+    global _shared, _shared_read_only
+    with _shared_lock:
+        if _shared is not None and _shared_read_only and not read_only:
+            if _cursors:
+                raise RuntimeError(
+                    "Database is open read-only with cursors in use - create writable repositories first"
+                )
+            _shared.close()
+            _shared = None
+        if _shared is None:
+            _ensure_db_exists()
+            _shared = duckdb.connect(DB_PATH, read_only=read_only)
+            _shared_read_only = read_only
+            logger.debug("DB connected: {} (read_only={})", DB_PATH, read_only)
+        return _shared
 
 
 def get_db(read_only: bool = True) -> duckdb.DuckDBPyConnection:
-    """Get thread-local connection."""
-    if not hasattr(_local, "conn") or _local.conn is None:
-        _ensure_db_exists()
-        _local.conn = duckdb.connect(DB_PATH, read_only=read_only)
-        logger.debug("DB connected: {} (read_only={})", DB_PATH, read_only)
-    return _local.conn
+    """Get the calling thread's cursor for a mode on the shared database handle.
+
+    A read-only request may be served by a read-write handle; read-only repositories don't write.
+    """
+    cursors = getattr(_local, "cursors", None)
+    if cursors is None:
+        cursors = _local.cursors = {}
+    cursor = cursors.get(read_only)
+    if cursor is None:
+        cursor = cursors[read_only] = _shared_db(read_only).cursor()
+        with _shared_lock:
+            _cursors.add(cursor)
+    return cursor
 
 
 def close_db() -> None:
-    """Close thread-local connection."""
-    if hasattr(_local, "conn") and _local.conn:
-        _local.conn.close()
-        _local.conn = None
-        logger.debug("DB connection closed")
+    """Close the calling thread's cursors, and the shared handle once no thread holds one (releasing the file)."""
+    global _shared
+    cursors = getattr(_local, "cursors", None) or {}
+    _local.cursors = {}
+    with _shared_lock:
+        for cursor in cursors.values():
+            _cursors.discard(cursor)
+            cursor.close()
+        if _shared is not None and not _cursors:
+            _shared.close()
+            _shared = None
+            logger.debug("DB connection closed")
 
 
 def reconnect_db(read_only: bool = True) -> duckdb.DuckDBPyConnection:
@@ -68,9 +122,9 @@ def reconnect_db(read_only: bool = True) -> duckdb.DuckDBPyConnection:
     return get_db(read_only)
 
 
-def get_write_connection() -> duckdb.DuckDBPyConnection:
-    """Get a writable connection (for ETL operations)."""
+def get_write_connection(config: dict | None = None) -> duckdb.DuckDBPyConnection:
+    """Get a writable connection (for ETL operations), with optional DuckDB settings."""
     _ensure_db_exists()
-    conn = duckdb.connect(DB_PATH)
+    conn = duckdb.connect(DB_PATH, config=config or {})
     init_tables(conn)
     return conn
@@ -1,5 +1,7 @@
 """Process repository - access to legislative processes data."""
 
+import numpy as np
+
 from app.repositories.base import BaseRepository
 
 
@@ -38,32 +40,63 @@ class ProcessRepository(BaseRepository):
         key = f"processes_{term_id}_{'passed' if passed_only else 'all'}"
         return self._cached(key, fetch)
 
-    def get_process_voting_links(self, term_id: int) -> list[dict]:
-        """Get links between processes and votings."""
+    def get_labeled_columns(self, term_id: int) -> dict[str, np.ndarray]:
+        """Get title, document_type and passed of a term's decided processes, as NumPy columns."""
+
+        def fetch():
+            return self.fetch_numpy(
+                """
+                SELECT title, document_type, passed
+                FROM process
+                WHERE term_id = ? AND passed IS NOT NULL
+                ORDER BY process_start_date DESC
+                """,
+                [term_id],
+            )
+
+        return self._cached(f"labeled_columns_{term_id}", fetch)
+
+    def get_topic_groups(self, term_id: int, patterns: dict[str, str], default: str) -> list[dict]:
+        """Group a term's processes by topic, largest group first.
+
+        A process gets the topic of the first regex in `patterns` (regex -> topic) matching its
+        lowercased title, else `default`. Each group lists up to 50 titles, newest first.
+        """
 
         def fetch():
+            cases = " ".join("WHEN regexp_matches(lower(title), ?) THEN ?" for _ in patterns)
+            params = [x for pattern, topic in patterns.items() for x in (pattern, topic)]
             rows = self.fetchall(
+                f"""
+                SELECT CASE {cases} ELSE ? END AS topic,
+                       COUNT(*),
+                       COUNT(*) FILTER (WHERE passed),
+                       list(title ORDER BY process_start_date DESC)[1:50]
+                FROM process
+                WHERE term_id = ?
+                GROUP BY topic
+                ORDER BY COUNT(*) DESC, max(process_start_date) DESC
+                """,
+                [*params, default, term_id],
+            )
+            return [{"topic": r[0], "count": r[1], "passed": r[2], "titles": r[3]} for r in rows]
+
+        return self._persisted(term_id, f"topic_groups_{term_id}", fetch)
+
+    def get_process_voting_links(self, term_id: int) -> dict[str, np.ndarray]:
+        """Get links between processes and votings, as NumPy columns."""
+
+        def fetch():
+            return self.fetch_numpy(
                 """
                 SELECT ps.process_id, ps.voting_id, ps.stage_name, ps.decision,
-                       p.number, p.title, p.passed
+                       p.number as process_number, p.title as process_title, p.passed
                 FROM process_stage ps
                 JOIN process p ON ps.process_id = p.id
                 WHERE p.term_id = ? AND ps.voting_id IS NOT NULL
                 """,
                 [term_id],
             )
-            return [
-                {
-                    "process_id": r[0],
-                    "voting_id": r[1],
-                    "stage_name": r[2],
-                    "decision": r[3],
-                    "process_number": r[4],
-                    "process_title": r[5],
-                    "passed": r[6],
-                }
-                for r in rows
-            ]
 
         return self._cached(f"process_votings_{term_id}", fetch)
 
@@ -71,34 +104,35 @@ class ProcessRepository(BaseRepository):
         """Get aggregate statistics for processes."""
 
         def fetch():
-            basic = self.fetchone(
-                """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN passed = true THEN 1 ELSE 0 END) as passed,
-                    SUM(CASE WHEN passed = false THEN 1 ELSE 0 END) as rejected
-                FROM process WHERE term_id = ?
-                """,
-                [term_id],
-            )
-
-            by_type = self.fetchall(
+            # One scan: per-type rows plus the grand total row (GROUPING(document_type) = 1)
+            rows = self.fetchall(
                 """
-                SELECT document_type,
+                SELECT GROUPING(document_type) as is_total,
+                       document_type,
                        COUNT(*) as total,
-                       SUM(CASE WHEN passed THEN 1 ELSE 0 END) as passed
+                       COUNT(*) FILTER (WHERE passed) as passed,
+                       COUNT(*) FILTER (WHERE NOT passed) as rejected
                 FROM process WHERE term_id = ?
-                GROUP BY document_type
-                ORDER BY COUNT(*) DESC
+                GROUP BY GROUPING SETS ((document_type), ())
+                ORDER BY is_total DESC, COUNT(*) DESC
                 """,
                 [term_id],
             )
+            basic, by_type = rows[0], rows[1:]
 
             return {
-                "total": basic[0] or 0,
-                "passed": basic[1] or 0,
-                "rejected": basic[2] or 0,
-                "by_type": [{"type": r[0], "total": r[1], "passed": r[2]} for r in by_type],
+                "total": basic[2],
+                "passed": basic[3],
+                "rejected": basic[4],
+                "by_type": [{"type": r[1], "total": r[2], "passed": r[3]} for r in by_type],
             }
 
-        return self._cached(f"process_stats_{term_id}", fetch)
+        return self._persisted(term_id, f"process_stats_{term_id}", fetch)
+
+    def data_version(self, term_id: int) -> str:
+        """Stamp of a term's process data that changes whenever a sync adds processes (not cached)."""
+        count, last_change = self.fetchone(
+            "SELECT COUNT(*), MAX(change_date) FROM process WHERE term_id = ?",
+            [term_id],
+        )
+        return f"{count}:{last_change}"
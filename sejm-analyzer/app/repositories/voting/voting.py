@@ -1,7 +1,7 @@
 """Voting repository - access to votings and votes data."""
 
-from collections import defaultdict
-
+import numpy as np
+import pyarrow as pa
 from loguru import logger
 
 from app.repositories.base import BaseRepository
@@ -10,97 +10,84 @@ from app.repositories.base import BaseRepository
 class VotingRepository(BaseRepository):
     """Repository for voting and vote data access."""
 
-    def get_party_decisions(self, term_id: int) -> list[dict]:
-        """Get party majority vote per voting."""
+    def get_party_decisions_arrow(self, term_id: int) -> pa.Table:
+        """Get party majority vote per voting as columns: voting_id, party, yes, no, decision."""
 
         def fetch():
-            rows = self.fetchall(
+            table = self.fetch_arrow(
                 """
-                SELECT v.voting_id, v.club,
-                       SUM(CASE WHEN v.vote = 'YES' THEN 1 ELSE 0 END) as yes,
-                       SUM(CASE WHEN v.vote = 'NO' THEN 1 ELSE 0 END) as no
-                FROM vote v
-                JOIN voting vt ON v.voting_id = vt.id
-                WHERE vt.term_id = ? AND v.club IS NOT NULL
-                GROUP BY v.voting_id, v.club
+                SELECT voting_id, party, yes, no,
+                       CASE WHEN yes > no THEN 'YES' ELSE 'NO' END as decision
+                FROM (
+                    SELECT v.voting_id, v.club as party,
+                           COUNT(*) FILTER (WHERE v.vote = 'YES') as yes,
+                           COUNT(*) FILTER (WHERE v.vote = 'NO') as no
+                    FROM vote v
+                    JOIN voting vt ON v.voting_id = vt.id
+                    WHERE vt.term_id = ? AND v.club IS NOT NULL
+                    GROUP BY v.voting_id, v.club
+                )
                 """,
                 [term_id],
             )
-            result = [
-                {
-                    "voting_id": r[0],
-                    "party": r[1],
-                    "yes": int(r[2]),
-                    "no": int(r[3]),
-                    "decision": "YES" if int(r[2]) > int(r[3]) else "NO",
-                }
-                for r in rows
-            ]
-            logger.debug("get_party_decisions({}): {} decisions", term_id, len(result))
-            return result
+            logger.debug("get_party_decisions({}): {} decisions", term_id, table.num_rows)
+            return table
 
-        return self._cached(f"decisions_{term_id}", fetch)
+        return self._cached(f"decisions_arrow_{term_id}", fetch)
 
-    def get_vote_sequences(self, term_id: int) -> dict[str, list[str]]:
-        """Get vote sequences per party for Markov analysis."""
+    def get_party_decisions(self, term_id: int) -> list[dict]:
+        """Get party majority vote per voting."""
+        return self.get_party_decisions_arrow(term_id).to_pylist()
+
+    def get_vote_sequences(self, term_id: int) -> dict[str, list[bool]]:
+        """Get vote sequences per party for Markov analysis (True = party voted YES)."""
 
         def fetch():
             rows = self.fetchall(
                 """
                 WITH decisions AS (
                     SELECT v.club, vt.date,
-                           CASE WHEN SUM(CASE WHEN v.vote='YES' THEN 1 ELSE 0 END) >
-                                     SUM(CASE WHEN v.vote='NO' THEN 1 ELSE 0 END)
-                                THEN 'YES' ELSE 'NO' END as decision
+                           COUNT(*) FILTER (WHERE v.vote = 'YES') > COUNT(*) FILTER (WHERE v.vote = 'NO') as decision
                     FROM vote v JOIN voting vt ON v.voting_id = vt.id
                     WHERE vt.term_id = ? AND v.club IS NOT NULL
                     GROUP BY v.club, vt.id, vt.date
-                    ORDER BY v.club, vt.date
                 )
-                SELECT club, decision FROM decisions
+                SELECT club, list(decision ORDER BY date) FROM decisions GROUP BY club ORDER BY club
                 """,
                 [term_id],
             )
 
-            result = defaultdict(list)
-            for party, decision in rows:
-                result[party].append(decision)
+            result = dict(rows)
             logger.debug("get_vote_sequences({}): {} parties", term_id, len(result))
-            return dict(result)
+            return result
+
+        return self._persisted(term_id, f"sequences_{term_id}", fetch)
 
-        return self._cached(f"sequences_{term_id}", fetch)
+    def get_voting_with_process(self, term_id: int) -> dict[str, np.ndarray]:
+        """Get votings enriched with process info, as NumPy columns (one row per voting).
 
-    def get_voting_with_process(self, term_id: int) -> list[dict]:
-        """Get votings enriched with process info."""
+        A voting referenced by several stages is paired with one process; see
+        ProcessRepository.get_process_voting_links for every link.
+        """
 
         def fetch():
-            rows = self.fetchall(
+            return self.fetch_numpy(
                 """
-                SELECT v.id, v.title, v.topic, v.date, v.yes, v.no,
+                SELECT v.id as voting_id, v.title as voting_title, v.topic, v.date, v.yes, v.no,
                        p.number as process_number, p.title as process_title,
                        p.document_type, p.passed
                 FROM voting v
-                LEFT JOIN process_stage ps ON ps.voting_id = v.id
+                LEFT JOIN (
+                    SELECT voting_id, MIN(process_id) as process_id
+                    FROM process_stage
+                    WHERE voting_id IS NOT NULL
+                    GROUP BY voting_id
+                ) ps ON ps.voting_id = v.id
                 LEFT JOIN process p ON ps.process_id = p.id
                 WHERE v.term_id = ?
                 ORDER BY v.date DESC
                 """,
                 [term_id],
             )
-            return [
-                {
-                    "voting_id": r[0],
-                    "voting_title": r[1],
-                    "topic": r[2],
-                    "date": r[3],
-                    "yes": r[4],
-                    "no": r[5],
-                    "process_number": r[6],
-                    "process_title": r[7],
-                    "document_type": r[8],
-                    "passed": r[9],
-                }
-                for r in rows
-            ]
 
         return self._cached(f"voting_process_{term_id}", fetch)
@@ -39,9 +39,7 @@ class DashboardService:
 
     def get_overview(self, term_id: int) -> dict:
         """Get dashboard overview for a term."""
-        parties = self._mp.get_parties(term_id)
-        parties_count = len(parties)
-        total_seats = sum(parties.values())
+        parties_count, total_seats = self._mp.get_parties_summary(term_id)
 
         # Count votings
         votings = self._voting.fetchone(
@@ -1,24 +1,13 @@
 """Legislation analytics service."""
 
-from dataclasses import dataclass
-
 import numpy as np
 from loguru import logger
 
+from app.models.legislation.entities import PredictionResult
 from app.repositories.legislation import ProcessRepository
 from app.services.legislation.topic_modeling import TopicModeling
 
 
-@dataclass
-class PredictionResult:
-    """Prediction result for a process."""
-
-    process_id: str
-    predicted_pass: bool
-    probability: float
-    top_features: list[tuple[str, float]]
-
-
 class LegislationAnalytics:
     """Legislation analytics with pass prediction."""
 
@@ -34,108 +23,162 @@ class LegislationAnalytics:
 
     def _sigmoid(self, z: np.ndarray) -> np.ndarray:
         """Sigmoid activation function."""
-        return 1 / (1 + np.exp(-np.clip(z, -500, 500)))
-
-    def _extract_features(self, process: dict) -> np.ndarray:
-        """Extract feature vector from a process."""
-        features = []
-
-        # Document type one-hot
-        doc_type = process.get("document_type", "unknown")
-        for dt in self._doc_type_map:
-            features.append(1.0 if doc_type == dt else 0.0)
-
-        # Topic one-hot
-        topic, _ = self.topic_model.detect_topic(process.get("title", ""))
-        for t in self._topic_map:
-            features.append(1.0 if topic == t else 0.0)
-
-        # Base rates
-        features.append(self._base_rates.get(doc_type, 0.5))
-        features.append(self._base_rates.get(f"topic_{topic}", 0.5))
+        # +-80 keeps exp() finite in float32; the output is already 0/1 to float precision there
+        return 1 / (1 + np.exp(-np.clip(z, -80, 80)))
+
+    def _detect_topics(self, titles: np.ndarray) -> list[str]:
+        """Detected topic of each title."""
+        return [self.topic_model.detect_topic(t)[0] for t in titles]
+
+    def _build_feature_matrix(self, doc_types: np.ndarray, topics: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Feature matrix in sparse form, one row per process.
+
+        Each row has at most one document-type and one topic one-hot, returned as (n, 2) column
+        indices (-1 for a category unseen in training), plus the (n, 2) dense base-rate columns.
+        """
+        n, n_doc_types = len(doc_types), len(self._doc_type_map)
+        onehot = np.empty((n, 2), dtype=np.int64)
+        onehot[:, 0] = np.fromiter((self._doc_type_map.get(dt, -1) for dt in doc_types), np.int64, n)
+        topic_idx = np.fromiter((self._topic_map.get(t, -1) for t in topics), np.int64, n)
+        onehot[:, 1] = np.where(topic_idx >= 0, n_doc_types + topic_idx, -1)
+
+        # float32 as in the training loop: half the memory traffic, same convergence
+        rates = np.empty((n, 2), dtype=np.float32)
+        rates[:, 0] = [self._base_rates.get(dt, 0.5) for dt in doc_types]
+        rates[:, 1] = [self._base_rates.get(f"topic_{t}", 0.5) for t in topics]
+        return onehot, rates
+
+    def _scores(self, onehot: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        """Linear scores X @ w + b for a feature matrix from _build_feature_matrix."""
+        n_onehot = len(self._weights) - 2
+        return (
+            np.where(onehot >= 0, self._weights[onehot], 0).sum(axis=1) + rates @ self._weights[n_onehot:] + self._bias
+        )
 
-        return np.array(features)
+    def train(self, term_id: int, learning_rate: float = 0.1, iterations: int = 1000, tol: float = 1e-5) -> None:
+        """Train the prediction model on historical data.
 
-    def train(self, term_id: int, learning_rate: float = 0.1, iterations: int = 1000) -> None:
-        """Train the prediction model on historical data."""
-        processes = self.repo.get_processes(term_id)
+        Stops early once the loss improves by less than `tol` over a check interval, or the
+        gradient norm falls below `tol`.
+        """
+        # Column per field (title, document_type, passed) rather than a dict per process
+        labeled = self.repo.get_labeled_columns(term_id)
+        n = len(labeled["passed"])
 
-        if not processes:
+        if not n:
             logger.warning("No processes for training (term {})", term_id)
             return
 
-        labeled = [p for p in processes if p.get("passed") is not None]
-        logger.info("Training on {} labeled processes", len(labeled))
+        logger.info("Training on {} labeled processes", n)
+
+        # Per-row labels, detected once and reused for the vocabulary, indices and base rates
+        row_doc_types = labeled["document_type"]
+        row_topics = self._detect_topics(labeled["title"])
 
         # Build vocabulary
-        doc_types = sorted({p.get("document_type", "unknown") for p in labeled})
+        doc_types = sorted(set(row_doc_types))
         self._doc_type_map = {dt: i for i, dt in enumerate(doc_types)}
 
-        topics = sorted({self.topic_model.detect_topic(p["title"])[0] for p in labeled})
+        topics = sorted(set(row_topics))
         self._topic_map = {t: i for i, t in enumerate(topics)}
 
-        # Compute base rates
-        for dt in doc_types:
-            subset = [p for p in labeled if p.get("document_type") == dt]
-            self._base_rates[dt] = sum(1 for p in subset if p["passed"]) / len(subset) if subset else 0.5
+        n_doc_types = len(self._doc_type_map)
+        doc_idx = np.fromiter((self._doc_type_map[dt] for dt in row_doc_types), np.int64, n)
+        topic_idx = np.fromiter((self._topic_map[t] for t in row_topics), np.int64, n)
+        y = labeled["passed"].astype(np.float32)
 
-        for topic in topics:
-            subset = [p for p in labeled if self.topic_model.detect_topic(p["title"])[0] == topic]
-            self._base_rates[f"topic_{topic}"] = sum(1 for p in subset if p["passed"]) / len(subset) if subset else 0.5
+        # Base rates: pass share per document type and per topic, from one histogram each
+        doc_rates = np.bincount(doc_idx, y, n_doc_types) / np.bincount(doc_idx, minlength=n_doc_types)
+        topic_rates = np.bincount(topic_idx, y, len(topics)) / np.bincount(topic_idx, minlength=len(topics))
+        self._base_rates.update(zip(doc_types, doc_rates.tolist()))
+        self._base_rates.update(zip([f"topic_{t}" for t in topics], topic_rates.tolist()))
 
-        # Build feature matrix
-        X = np.array([self._extract_features(p) for p in labeled])
-        y = np.array([1.0 if p["passed"] else 0.0 for p in labeled])
+        onehot, rates = self._build_feature_matrix(row_doc_types, row_topics)
+        n_onehot = n_doc_types + len(self._topic_map)
+        # Base-rate columns transposed once, so the gradient reads each as one contiguous row
+        rates_t = np.ascontiguousarray(rates.T)
 
         self._feature_names = list(self._doc_type_map.keys()) + [f"topic_{t}" for t in self._topic_map]
         self._feature_names += ["base_rate_doctype", "base_rate_topic"]
 
+        # X @ w gathers the two one-hot weights; X.T @ e scatters e back onto them with a bincount
+        def matvec(w: np.ndarray) -> np.ndarray:
+            return w[onehot].sum(axis=1) + rates @ w[n_onehot:]
+
         # Initialize and train
-        n_features = X.shape[1]
-        self._weights = np.zeros(n_features)
+        self._weights = np.zeros(n_onehot + 2, dtype=np.float32)
         self._bias = 0.0
+        predictions = np.empty(n, dtype=np.float32)
+        error = np.empty(n, dtype=np.float32)
+        dw = np.empty(n_onehot + 2, dtype=np.float32)
+        prev_loss = np.inf
 
         for i in range(iterations):
-            z = X @ self._weights + self._bias
-            predictions = self._sigmoid(z)
-
-            error = predictions - y
-            dw = (X.T @ error) / len(y)
+            # Forward pass, sigmoid, error and gradient written into the preallocated buffers:
+            # the only per-iteration temporaries are the length-n scores and the small bincounts
+            z = matvec(self._weights)
+            z += self._bias
+            np.clip(z, -80, 80, out=predictions)
+            np.exp(np.negative(predictions, out=predictions), out=predictions)
+            np.reciprocal(np.add(predictions, 1, out=predictions), out=predictions)
+            np.subtract(predictions, y, out=error)
+
+            dw[:n_doc_types] = np.bincount(doc_idx, error, n_doc_types)
+            dw[n_doc_types:n_onehot] = np.bincount(topic_idx, error, len(topics))
+            dw[n_onehot:] = rates_t @ error
+            dw /= n
             db = np.mean(error)
 
             self._weights -= learning_rate * dw
             self._bias -= learning_rate * db
 
-            if i % 200 == 0:
-                loss = -np.mean(y * np.log(predictions + 1e-10) + (1 - y) * np.log(1 - predictions + 1e-10))
-                acc = np.mean((predictions > 0.5) == y)
-                logger.debug("Iteration {}: loss={:.4f}, accuracy={:.2f}%", i, loss, acc * 100)
-
-        final_pred = self._sigmoid(X @ self._weights + self._bias)
+            if i % 50 == 0:
+                # Cross-entropy from the scores: log(1 + e^z) - y*z, stable without an epsilon
+                loss = np.mean(np.logaddexp(0, z) - y * z)
+                if i % 200 == 0:
+                    acc = np.mean((predictions > 0.5) == y)
+                    logger.debug("Iteration {}: loss={:.4f}, accuracy={:.2f}%", i, loss, acc * 100)
+                if prev_loss - loss < tol or np.linalg.norm(dw) < tol:
+                    logger.debug("Converged after {} iterations", i + 1)
+                    break
+                prev_loss = loss
+
+        final_pred = self._sigmoid(self._scores(onehot, rates))
         accuracy = np.mean((final_pred > 0.5) == y)
         logger.info("Training complete. Accuracy: {:.2f}%", accuracy * 100)
 
     def predict(self, process: dict) -> PredictionResult:
         """Predict if a process will pass."""
+        return self.predict_batch([process])[0]
+
+    def predict_batch(self, processes: list[dict]) -> list[PredictionResult]:
+        """Predict if each process will pass, scoring all of them at once."""
         if self._weights is None:
             raise ValueError("Model not trained. Call train() first.")
 
-        features = self._extract_features(process)
-        prob = self._sigmoid(features @ self._weights + self._bias)
-
-        contributions = features * self._weights
-        top_indices = np.argsort(np.abs(contributions))[-5:][::-1]
-        top_features = [
-            (self._feature_names[i] if i < len(self._feature_names) else f"f{i}", float(contributions[i]))
-            for i in top_indices
-        ]
-
-        return PredictionResult(
-            process_id=process.get("id", "unknown"),
-            predicted_pass=prob > 0.5,
-            probability=float(prob),
-            top_features=top_features,
+        doc_types = [p.get("document_type", "unknown") for p in processes]
+        onehot, rates = self._build_feature_matrix(
+            doc_types, self._detect_topics([p.get("title", "") for p in processes])
         )
+        probs = self._sigmoid(self._scores(onehot, rates))
+
+        # Only the set one-hot columns and the two base rates contribute: (n, 4) columns and values
+        n_onehot = len(self._weights) - 2
+        columns = np.hstack([onehot, np.broadcast_to([n_onehot, n_onehot + 1], onehot.shape)])
+        contributions = np.hstack([np.where(onehot >= 0, self._weights[onehot], 0), rates * self._weights[n_onehot:]])
+        order = np.argsort(-np.abs(contributions), axis=1, kind="stable")
+
+        results = []
+        for process, prob, cols, contribs, idx in zip(processes, probs, columns, contributions, order):
+            results.append(
+                PredictionResult(
+                    process_id=process.get("id", "unknown"),
+                    predicted_pass=prob > 0.5,
+                    probability=float(prob),
+                    top_features=[(self._feature_names[cols[k]], float(contribs[k])) for k in idx if cols[k] >= 0],
+                )
+            )
+        return results
 
     def get_model_stats(self) -> dict:
         """Get model statistics and feature importance."""
@@ -158,10 +201,16 @@ class LegislationAnalytics:
         """Get topic statistics."""
         return self.topic_model.get_topic_stats(term_id)
 
-    def get_processes_data(self, term_id: int) -> dict:
-        """Get processes data for a term."""
+    def data_version(self, term_id: int) -> str:
+        """Stamp of the term's process data, for keying caches of results derived from it."""
+        return self.repo.data_version(term_id)
+
+    def get_processes_data(self, term_id: int, limit: int = 10) -> dict:
+        """Get processes data for a term, with the `limit` most common document types."""
         processes = self.repo.get_processes(term_id)
         process_stats = self.repo.get_process_stats(term_id)
+        # by_type is ordered by count; copy rather than slice the cached dict in place
+        process_stats = {**process_stats, "by_type": process_stats["by_type"][:limit]}
         voting_links = self.repo.get_process_voting_links(term_id)
         return {
             "processes": processes,
@@ -171,42 +220,31 @@ class LegislationAnalytics:
 
     def evaluate(self, term_id: int) -> dict:
         """Evaluate model on data."""
-        processes = self.repo.get_processes(term_id)
-        labeled = [p for p in processes if p.get("passed") is not None]
+        labeled = self.repo.get_labeled_columns(term_id)
+        n = len(labeled["passed"])
 
-        if not labeled or self._weights is None:
+        if not n or self._weights is None:
             return {"error": "No data or model not trained"}
 
-        correct = 0
-        true_pos = 0
-        false_pos = 0
-        true_neg = 0
-        false_neg = 0
-
-        for p in labeled:
-            result = self.predict(p)
-            actual = p["passed"]
-
-            if result.predicted_pass == actual:
-                correct += 1
-                if actual:
-                    true_pos += 1
-                else:
-                    true_neg += 1
-            else:
-                if result.predicted_pass:
-                    false_pos += 1
-                else:
-                    false_neg += 1
+        # Score all processes at once instead of one predict() per row
+        features = self._build_feature_matrix(labeled["document_type"], self._detect_topics(labeled["title"]))
+        predicted = self._sigmoid(self._scores(*features)) > 0.5
+        actual = labeled["passed"].astype(bool)
+
+        true_pos = int(np.count_nonzero(predicted & actual))
+        false_pos = int(np.count_nonzero(predicted & ~actual))
+        true_neg = int(np.count_nonzero(~predicted & ~actual))
+        false_neg = int(np.count_nonzero(~predicted & actual))
+        correct = true_pos + true_neg
 
         precision = true_pos / (true_pos + false_pos) if (true_pos + false_pos) > 0 else 0
         recall = true_pos / (true_pos + false_neg) if (true_pos + false_neg) > 0 else 0
         f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0
 
         return {
-            "accuracy": correct / len(labeled),
+            "accuracy": correct / n,
             "precision": precision,
             "recall": recall,
             "f1_score": f1,
-            "total_samples": len(labeled),
+            "total_samples": n,
         }
@@ -1,69 +1,60 @@
 """Topic modeling for legislative processes."""
 
 import re
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
 
 from loguru import logger
 
+from app.models.legislation.entities import TopicCluster
 from app.repositories.legislation import ProcessRepository
 
 
-@dataclass
-class TopicCluster:
-    """A topic cluster with keywords and processes."""
-
-    topic_id: int
-    name: str
-    keywords: list[str]
-    process_count: int
-    pass_rate: float
-    example_titles: list[str]
-
-
 class TopicModeling:
     """Extract topics from legislative process titles using keyword analysis."""
 
     # Polish stopwords
-    STOPWORDS = {
-        "w",
-        "i",
-        "z",
-        "na",
-        "do",
-        "o",
-        "oraz",
-        "przez",
-        "dla",
-        "ze",
-        "od",
-        "po",
-        "się",
-        "jest",
-        "jako",
-        "tym",
-        "też",
-        "już",
-        "lub",
-        "być",
-        "sprawie",
-        "projekt",
-        "ustawy",
-        "uchwały",
-        "zmianie",
-        "niektórych",
-        "poselski",
-        "rządowy",
-        "senacki",
-        "komisyjny",
-        "obywatelski",
-        "przedstawiony",
-        "druk",
-        "nr",
-        "poseł",
-        "posła",
-        "kandydat",
-    }
+    STOPWORDS = frozenset(
+        {
+            "w",
+            "i",
+            "z",
+            "na",
+            "do",
+            "o",
+            "oraz",
+            "przez",
+            "dla",
+            "ze",
+            "od",
+            "po",
+            "się",
+            "jest",
+            "jako",
+            "tym",
+            "też",
+            "już",
+            "lub",
+            "być",
+            "sprawie",
+            "projekt",
+            "ustawy",
+            "uchwały",
+            "zmianie",
+            "niektórych",
+            "poselski",
+            "rządowy",
+            "senacki",
+            "komisyjny",
+            "obywatelski",
+            "przedstawiony",
+            "druk",
+            "nr",
+            "poseł",
+            "posła",
+            "kandydat",
+        }
+    )
 
     # Topic patterns (regex -> topic name)
     TOPIC_PATTERNS = {
@@ -87,61 +78,71 @@ class TopicModeling:
         r"korupc|przejrzyst|lobbying": "Antykorupcja",
     }
 
+    # All patterns in one regex: a lookahead per topic, tried in TOPIC_PATTERNS order, so the
+    # first listed topic that matches anywhere in the title wins (as with per-pattern searches)
+    _TOPIC_RE = re.compile(
+        "|".join(f"(?=.*?(?P<t{i}>{pattern}))" for i, pattern in enumerate(TOPIC_PATTERNS)), re.DOTALL
+    )
+    _TOPIC_GROUPS = {f"t{i}": topic for i, topic in enumerate(TOPIC_PATTERNS.values())}
+    # Keywords are words longer than 3 letters - the length filter is part of the match
+    _WORD_RE = re.compile(r"[a-ząćęłńóśźż]{4,}")
+
     def __init__(self, repo: ProcessRepository):
         self.repo = repo
 
+    def _tokenize(self, text: str) -> list[str]:
+        """Lowercase words of a text, without stopwords and short words."""
+        stopwords = self.STOPWORDS
+        return [w for w in self._WORD_RE.findall(text.lower()) if w not in stopwords]
+
+    @staticmethod
+    def _top_words(words: list[str], top_n: int) -> list[str]:
+        """Most frequent words, ties in order of appearance."""
+        if len(set(words)) == len(words):
+            # No repeats (typical for a title): the ranking is just the original order
+            return words[:top_n]
+        return [w for w, _ in Counter(words).most_common(top_n)]
+
     def extract_keywords(self, text: str, top_n: int = 10) -> list[str]:
         """Extract keywords from text using simple tokenization."""
-        text = text.lower()
-        words = re.findall(r"[a-ząćęłńóśźż]+", text)
-        words = [w for w in words if w not in self.STOPWORDS and len(w) > 3]
-        counter = Counter(words)
-        return [w for w, _ in counter.most_common(top_n)]
-
-    def detect_topic(self, title: str) -> tuple[str, float]:
-        """Detect topic from title using pattern matching."""
-        title_lower = title.lower()
+        return self._top_words(self._tokenize(text), top_n)
 
-        for pattern, topic in self.TOPIC_PATTERNS.items():
-            if re.search(pattern, title_lower):
-                return topic, 1.0
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def detect_topic(cls, title: str) -> tuple[str, float]:
+        """Detect topic from title using pattern matching (memoized - patterns are class constants)."""
+        match = cls._TOPIC_RE.match(title.lower())
+        if match:
+            return cls._TOPIC_GROUPS[match.lastgroup], 1.0
 
         return "Inne", 0.5
 
     def analyze_topics(self, term_id: int) -> list[TopicCluster]:
         """Analyze all processes and cluster by topic."""
-        processes = self.repo.get_processes(term_id)
+        # Topic detection and grouping run in DuckDB; only the titles needed for keywords come back
+        groups = self.repo.get_topic_groups(term_id, self.TOPIC_PATTERNS, "Inne")
 
-        if not processes:
+        if not groups:
             logger.warning("No processes for term {}", term_id)
             return []
 
-        # Group by topic
-        topic_groups: dict[str, list] = defaultdict(list)
-        for p in processes:
-            topic, _ = self.detect_topic(p["title"])
-            topic_groups[topic].append(p)
-
         # Build clusters
         clusters = []
-        for i, (topic, procs) in enumerate(sorted(topic_groups.items(), key=lambda x: -len(x[1]))):
-            passed = sum(1 for p in procs if p.get("passed"))
-            pass_rate = passed / len(procs) if procs else 0
-
+        for i, group in enumerate(groups):
             # Extract common keywords from this topic
-            all_keywords = []
-            for p in procs[:50]:
-                all_keywords.extend(self.extract_keywords(p["title"], 5))
-            top_keywords = [w for w, _ in Counter(all_keywords).most_common(8)]
+            keyword_counts = Counter()
+            for title in group["titles"]:
+                keyword_counts.update(self._top_words(self._tokenize(title), 5))
+            top_keywords = [w for w, _ in keyword_counts.most_common(8)]
 
             clusters.append(
                 TopicCluster(
                     topic_id=i,
-                    name=topic,
+                    name=group["topic"],
                     keywords=top_keywords,
-                    process_count=len(procs),
-                    pass_rate=pass_rate,
-                    example_titles=[p["title"][:80] for p in procs[:3]],
+                    process_count=group["count"],
+                    pass_rate=group["passed"] / group["count"],
+                    example_titles=[t[:80] for t in group["titles"][:3]],
                 )
             )
 
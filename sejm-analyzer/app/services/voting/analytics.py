@@ -1,8 +1,11 @@
 """Voting analytics service."""
 
-from collections import defaultdict
 from collections.abc import Callable
+from typing import Any
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger
 
 from app.models.voting.entities import Cohesion, PowerIndex
@@ -36,34 +39,116 @@ class VotingAnalytics:
         self._cache.set(term_id, key, result)
         return result
 
-    def power_indices(self, term_id: int) -> list[PowerIndex]:
-        """Power indices for all parties."""
+    def _compute_power_indices(self, term_id: int) -> list[dict]:
+        """Compute power indices (uncached)."""
+        seats = self._mp.get_parties(term_id)
+        total = sum(seats.values())
 
-        def compute() -> list[dict]:
-            seats = self._mp.get_parties(term_id)
-            total = sum(seats.values())
+        if not total:
+            logger.warning("No data for term {}", term_id)
+            return []
 
-            if not total:
-                logger.warning("No data for term {}", term_id)
-                return []
+        quota = total // 2 + 1
+        ss = formulas.shapley_shubik(seats, quota)
+        bz = formulas.banzhaf(seats, quota)
+
+        logger.info("Computed power indices for {} parties", len(seats))
+        return [
+            {
+                "party": p,
+                "seats": s,
+                "seats_pct": round(s / total * 100, 1),
+                "shapley": round(ss[p] * 100, 1),
+                "banzhaf": round(bz[p] * 100, 1),
+            }
+            for p, s in seats.items()
+        ]
+
+    def _compute_cohesion(self, term_id: int) -> list[dict]:
+        """Compute Rice index per party (uncached)."""
+        decisions = self._voting.get_party_decisions_arrow(term_id)
+        yn = np.column_stack([decisions["yes"].to_numpy(), decisions["no"].to_numpy()])
+        # Dictionary codes number parties in order of first appearance
+        parties = pc.dictionary_encode(decisions["party"]).combine_chunks()
+        names = parties.dictionary.to_pylist()
+
+        rice, counts = formulas.average_rice_grouped(yn, parties.indices.to_numpy(), len(names))
+
+        result = [
+            {"party": name, "rice_index": round(float(rice[i]), 3), "votings": int(counts[i])}
+            for i, name in enumerate(names)
+        ]
+
+        logger.info("Computed cohesion for {} parties", len(result))
+        return result
 
-            quota = total // 2 + 1
-            ss = formulas.shapley_shubik(seats, quota)
-            bz = formulas.banzhaf(seats, quota)
+    def _compute_markov(self, term_id: int) -> list[dict]:
+        """Compute Markov transition stats (uncached)."""
+        sequences = self._voting.get_vote_sequences(term_id)
 
-            logger.info("Computed power indices for {} parties", len(seats))
-            return [
+        result = []
+        for p, seq in sequences.items():
+            if len(seq) < 10:
+                continue
+            stats = formulas.transition_stats(seq)
+            result.append(
                 {
                     "party": p,
-                    "seats": s,
-                    "seats_pct": round(s / total * 100, 1),
-                    "shapley": round(ss[p] * 100, 1),
-                    "banzhaf": round(bz[p] * 100, 1),
+                    "momentum": round(stats["momentum"], 3),
+                    "volatility": round(stats["volatility"], 3),
                 }
-                for p, s in seats.items()
-            ]
+            )
+
+        logger.info("Computed Markov for {} parties", len(result))
+        return result
+
+    def _compute_coalitions(self, term_id: int) -> list[dict]:
+        """Compute minimum winning coalitions (uncached)."""
+        seats = self._mp.get_parties(term_id)
+        total = sum(seats.values())
+
+        if not total:
+            return []
 
-        data = self._get_cached_or_compute(term_id, "power_indices", compute)
+        result = [
+            {"parties": list(c[0]), "seats": c[1], "surplus": c[2]}
+            for c in formulas.min_coalitions(seats, total // 2 + 1)[:10]
+        ]
+        logger.info("Found {} coalitions", len(result))
+        return result
+
+    def _compute_agreement_matrix(self, term_id: int) -> dict[str, dict[str, float]]:
+        """Compute pairwise agreement rates (uncached)."""
+        parties = list(self._mp.get_parties(term_id).keys())
+        decisions = self._voting.get_party_decisions_arrow(term_id)
+
+        # Party x voting matrices: P = party voted, Y = party majority was YES.
+        # Codes are computed on the Arrow columns, without materializing a Python object per row
+        rows = pc.fill_null(pc.index_in(decisions["party"], value_set=pa.array(parties, pa.string())), -1).to_numpy()
+        cols = pc.dictionary_encode(decisions["voting_id"]).combine_chunks().indices.to_numpy()
+        is_yes = decisions["yes"].to_numpy() > decisions["no"].to_numpy()
+        known = rows >= 0
+
+        present = np.zeros((len(parties), cols.max() + 1 if len(cols) else 0), dtype=bool)
+        yes = np.zeros_like(present)
+        present[rows[known], cols[known]] = True
+        yes[rows[known], cols[known]] = is_yes[known]
+
+        # Pairwise counts of shared votings and of shared votings with the same decision
+        both, agree = formulas.pairwise_agreement(present, yes)
+
+        # Agreement rates in %, 0 for pairs that never voted together; a party always agrees with itself
+        rates = np.divide(agree, both, out=np.zeros(both.shape), where=both > 0) * 100
+        np.fill_diagonal(rates, 100.0)
+        # Python's round (exact decimal rounding) rather than ndarray.round, which can differ on ties
+        result = {p: {q: round(v, 1) for q, v in zip(parties, row)} for p, row in zip(parties, rates.tolist())}
+
+        logger.info("Computed agreement matrix {}x{}", len(parties), len(parties))
+        return result
+
+    def power_indices(self, term_id: int) -> list[PowerIndex]:
+        """Power indices for all parties."""
+        data = self._get_cached_or_compute(term_id, "power_indices", lambda: self._compute_power_indices(term_id))
         if not data:
             return []
 
@@ -72,19 +157,7 @@ class VotingAnalytics:
 
     def cohesion(self, term_id: int) -> list[Cohesion]:
         """Rice index per party."""
-
-        def compute() -> list[dict]:
-            by_party: dict[str, list] = defaultdict(list)
-            for d in self._voting.get_party_decisions(term_id):
-                by_party[d["party"]].append((d["yes"], d["no"]))
-
-            logger.info("Computed cohesion for {} parties", len(by_party))
-            return [
-                {"party": p, "rice_index": round(formulas.average_rice(v), 3), "votings": len(v)}
-                for p, v in by_party.items()
-            ]
-
-        data = self._get_cached_or_compute(term_id, "cohesion", compute)
+        data = self._get_cached_or_compute(term_id, "cohesion", lambda: self._compute_cohesion(term_id))
         if not data:
             return []
 
@@ -93,80 +166,29 @@ class VotingAnalytics:
 
     def markov(self, term_id: int) -> list[dict]:
         """Markov transitions per party."""
+        return self._get_cached_or_compute(term_id, "markov", lambda: self._compute_markov(term_id))
 
-        def compute() -> list[dict]:
-            sequences = self._voting.get_vote_sequences(term_id)
-
-            result = []
-            for p, seq in sequences.items():
-                if len(seq) < 10:
-                    continue
-                trans = formulas.transition_matrix(seq)
-                result.append(
-                    {
-                        "party": p,
-                        "momentum": round(formulas.momentum(trans), 3),
-                        "volatility": round(formulas.volatility(trans), 3),
-                    }
-                )
-
-            logger.info("Computed Markov for {} parties", len(result))
-            return result
-
-        return self._get_cached_or_compute(term_id, "markov", compute)
+    def total_seats(self, term_id: int) -> int:
+        """Total seats held by parties in a term."""
+        return self._mp.get_parties_summary(term_id)[1]
 
     def coalitions(self, term_id: int) -> list[dict]:
         """Minimum winning coalitions."""
-
-        def compute() -> list[dict]:
-            seats = self._mp.get_parties(term_id)
-            total = sum(seats.values())
-
-            if not total:
-                return []
-
-            result = [
-                {"parties": list(c[0]), "seats": c[1], "surplus": c[2]}
-                for c in formulas.min_coalitions(seats, total // 2 + 1)[:10]
-            ]
-            logger.info("Found {} coalitions", len(result))
-            return result
-
-        return self._get_cached_or_compute(term_id, "coalitions", compute)
+        return self._get_cached_or_compute(term_id, "coalitions", lambda: self._compute_coalitions(term_id))
 
     def agreement_matrix(self, term_id: int) -> dict[str, dict[str, float]]:
         """Pairwise party agreement rates."""
-
-        def compute() -> dict[str, dict[str, float]]:
-            parties = list(self._mp.get_parties(term_id).keys())
-            decisions = self._voting.get_party_decisions(term_id)
-
-            by_voting: dict[str, dict[str, bool]] = defaultdict(dict)
-            for d in decisions:
-                by_voting[d["voting_id"]][d["party"]] = d["decision"] == "YES"
-
-            voting_ids = list(by_voting.keys())
-            party_votes = {p: [by_voting[v].get(p) for v in voting_ids] for p in parties}
-
-            result = {}
-            for p1 in parties:
-                result[p1] = {}
-                for p2 in parties:
-                    if p1 == p2:
-                        result[p1][p2] = 100.0
-                        continue
-
-                    both = [(a, b) for a, b in zip(party_votes[p1], party_votes[p2]) if a is not None and b is not None]
-
-                    if both:
-                        result[p1][p2] = round(sum(a == b for a, b in both) / len(both) * 100, 1)
-                    else:
-                        result[p1][p2] = 0.0
-
-            logger.info("Computed agreement matrix {}x{}", len(parties), len(parties))
-            return result
-
-        return self._get_cached_or_compute(term_id, "agreement_matrix", compute)
+        return self._get_cached_or_compute(term_id, "agreement_matrix", lambda: self._compute_agreement_matrix(term_id))
+
+    def compute_all(self, term_id: int) -> dict[str, Any]:
+        """Compute all analytics for a term without touching the cache: {cache_key: data}."""
+        return {
+            "power_indices": self._compute_power_indices(term_id),
+            "cohesion": self._compute_cohesion(term_id),
+            "markov": self._compute_markov(term_id),
+            "coalitions": self._compute_coalitions(term_id),
+            "agreement_matrix": self._compute_agreement_matrix(term_id),
+        }
 
     def precompute_all(self, term_id: int) -> None:
         """Precompute and cache all analytics for a term."""
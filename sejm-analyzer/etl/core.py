@@ -1,10 +1,9 @@
 """Core ETL - sync MPs, clubs, sittings."""
 
 import duckdb
-import polars as pl
 from loguru import logger
 
-from etl.helpers import get_existing_ids
+from etl.helpers import bulk_insert, insert_new
 from sejm_client import safe_request
 from sejm_client.core import CoreClient
 
@@ -25,24 +24,17 @@ async def sync_core_data(
 
     # Clubs (with transaction)
     if clubs:
-        clubs_df = pl.DataFrame(
-            [
-                {
-                    "id": f"{term}_{c['id']}",
-                    "term_id": term,
-                    "abbr": c["id"],
-                    "name": c["name"],
-                    "members_count": c.get("membersCount", 0),
-                }
-                for c in clubs
-            ]
-        )
+        clubs_cols = {
+            "id": [f"{term}_{c['id']}" for c in clubs],
+            "term_id": [term] * len(clubs),
+            "abbr": [c["id"] for c in clubs],
+            "name": [c["name"] for c in clubs],
+            "members_count": [c.get("membersCount", 0) for c in clubs],
+        }
         conn.execute("BEGIN TRANSACTION")
         try:
             conn.execute("DELETE FROM club WHERE term_id = ?", [term])
-            conn.register("clubs_df", clubs_df)
-            conn.execute("INSERT INTO club SELECT * FROM clubs_df")
-            conn.unregister("clubs_df")
+            bulk_insert(conn, "club", clubs_cols)
             conn.execute("COMMIT")
         except Exception:
             conn.execute("ROLLBACK")
@@ -50,27 +42,20 @@ async def sync_core_data(
         logger.info("Clubs: {}", len(clubs))
 
     # MPs (with transaction)
-    mps_df = pl.DataFrame(
-        [
-            {
-                "id": f"{term}_{m['id']}",
-                "term_id": term,
-                "mp_id": m["id"],
-                "first_name": m["firstName"],
-                "last_name": m["lastName"],
-                "club": m.get("club"),
-                "district": m.get("districtName"),
-                "active": m.get("active", True),
-            }
-            for m in mps
-        ]
-    )
+    mps_cols = {
+        "id": [f"{term}_{m['id']}" for m in mps],
+        "term_id": [term] * len(mps),
+        "mp_id": [m["id"] for m in mps],
+        "first_name": [m["firstName"] for m in mps],
+        "last_name": [m["lastName"] for m in mps],
+        "club": [m.get("club") for m in mps],
+        "district": [m.get("districtName") for m in mps],
+        "active": [m.get("active", True) for m in mps],
+    }
     conn.execute("BEGIN TRANSACTION")
     try:
         conn.execute("DELETE FROM mp WHERE term_id = ?", [term])
-        conn.register("mps_df", mps_df)
-        conn.execute("INSERT INTO mp SELECT * FROM mps_df")
-        conn.unregister("mps_df")
+        bulk_insert(conn, "mp", mps_cols)
         conn.execute("COMMIT")
     except Exception:
         conn.execute("ROLLBACK")
@@ -79,25 +64,19 @@ async def sync_core_data(
 
     # Sittings
     sittings = [p for p in proceedings if p["number"] != 0]
-    existing_sittings = get_existing_ids(conn, "sitting", term)
-    new_sittings = [p for p in sittings if f"{term}_{p['number']}" not in existing_sittings]
+    added = 0
 
-    if new_sittings:
-        sittings_df = pl.DataFrame(
-            [
-                {
-                    "id": f"{term}_{p['number']}",
-                    "term_id": term,
-                    "number": p["number"],
-                    "dates": str(p.get("dates", [])),
-                }
-                for p in new_sittings
-            ]
-        )
-        conn.register("sittings_df", sittings_df)
-        conn.execute("INSERT INTO sitting SELECT * FROM sittings_df")
-        conn.unregister("sittings_df")
-        logger.info("Sittings: +{} new (total {})", len(new_sittings), len(sittings))
+    if sittings:
+        sittings_cols = {
+            "id": [f"{term}_{p['number']}" for p in sittings],
+            "term_id": [term] * len(sittings),
+            "number": [p["number"] for p in sittings],
+            "dates": [str(p.get("dates", [])) for p in sittings],
+        }
+        added = len(insert_new(conn, "sitting", sittings_cols))
+
+    if added:
+        logger.info("Sittings: +{} new (total {})", added, len(sittings))
     else:
         logger.info("Sittings: {} (all exist)", len(sittings))
 
@@ -1,24 +1,53 @@
 """ETL helper functions."""
 
 import duckdb
+import pyarrow as pa
 
 
-def get_existing_ids(conn: duckdb.DuckDBPyConnection, table: str, term: int) -> set[str]:
-    """Get existing IDs for a term from a table."""
-    try:
-        rows = conn.execute(f"SELECT id FROM {table} WHERE term_id = ?", [term]).fetchall()
-        return {r[0] for r in rows}
-    except Exception:
-        return set()
-
-
-def get_existing_voting_ids(conn: duckdb.DuckDBPyConnection, term: int) -> set[str]:
-    """Get voting IDs that already have votes loaded."""
+def get_existing_voting_ids(conn: duckdb.DuckDBPyConnection, terms: list[int]) -> dict[int, set[tuple[int, int]]]:
+    """Get (sitting_num, voting_num) of votings that already have votes loaded, per term (one query)."""
+    result: dict[int, set[tuple[int, int]]] = {t: set() for t in terms}
     try:
         rows = conn.execute(
-            "SELECT DISTINCT voting_id FROM vote WHERE voting_id LIKE ?",
-            [f"{term}_%"],
+            """
+            SELECT v.term_id, v.sitting_num, v.voting_num FROM voting v
+            WHERE v.term_id IN (SELECT UNNEST(?::INTEGER[]))
+              AND EXISTS (SELECT 1 FROM vote WHERE vote.voting_id = v.id)
+            """,
+            [terms],
         ).fetchall()
-        return {r[0] for r in rows}
     except Exception:
-        return set()
+        return result
+    for term, sitting, number in rows:
+        result[term].add((sitting, number))
+    return result
+
+
+def bulk_insert(conn: duckdb.DuckDBPyConnection, table: str, data: pa.Table | dict[str, list]) -> None:
+    """Append rows to a table via DuckDB's vectorized Arrow reader (no temp view, no SQL planning).
+
+    `data` is an Arrow table or a dict of column lists, in the table's column order.
+    """
+    if isinstance(data, dict):
+        data = pa.table(data)
+    conn.from_arrow(data).insert_into(table)
+
+
+def find_new(
+    conn: duckdb.DuckDBPyConnection, table: str, data: pa.Table | dict[str, list], key: str = "id"
+) -> pa.Table:
+    """Rows whose `key` is not in the table yet (anti-join inside DuckDB), without inserting them."""
+    if isinstance(data, dict):
+        data = pa.table(data)
+    return conn.from_arrow(data).join(conn.table(table).select(key), key, how="anti").to_arrow_table()
+
+
+def insert_new(conn: duckdb.DuckDBPyConnection, table: str, data: pa.Table | dict[str, list], key: str = "id") -> list:
+    """Insert only rows whose `key` is not in the table yet (anti-join inside DuckDB).
+
+    `data` is as for `bulk_insert`. Returns the keys of the inserted rows.
+    """
+    new_rows = find_new(conn, table, data, key)
+    if new_rows.num_rows:
+        conn.from_arrow(new_rows).insert_into(table)
+    return new_rows[key].to_pylist()
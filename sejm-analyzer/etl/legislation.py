@@ -3,35 +3,43 @@
 import asyncio
 
 import duckdb
-import polars as pl
 from loguru import logger
 
-from etl.helpers import get_existing_ids
+from etl.helpers import bulk_insert, find_new
 from sejm_client import safe_request
 from sejm_client.legislation import LegislationClient
 
 
-def flatten_stages(stages: list, depth: int = 0) -> list:
-    """Flatten nested stages structure."""
+def flatten_stages(stages: list) -> list:
+    """Flatten nested stages structure (pre-order: parent first, then its children)."""
     result = []
-    for stage in stages:
+    stack = stages[::-1]
+    while stack:
+        stage = stack.pop()
         result.append(stage)
-        children = stage.get("children", [])
+        children = stage.get("children")
         if children:
-            result.extend(flatten_stages(children, depth + 1))
+            stack.extend(reversed(children))
     return result
 
 
+def _stage_voting_id(term: int, stage: dict) -> str | None:
+    """Voting ID linked to a stage, if any."""
+    v = stage.get("voting")
+    if not v:
+        return None
+    return f"{term}_{v.get('sitting')}_{v.get('votingNumber')}"
+
+
 async def sync_processes(
     client: LegislationClient,
     term: int,
     conn: duckdb.DuckDBPyConnection,
+    batch_size: int = 50,
 ) -> None:
     """Sync legislative processes for a term."""
     logger.info("Syncing processes for term {}...", term)
 
-    existing = get_existing_ids(conn, "process", term)
-
     # Fetch all processes (with pagination)
     all_processes = []
     offset = 0
@@ -49,82 +57,88 @@ async def sync_processes(
 
     logger.info("Found {} processes", len(all_processes))
 
-    # Filter new processes
-    new_processes = [p for p in all_processes if f"{term}_{p['number']}" not in existing]
+    if not all_processes:
+        return
+
+    # Processes not yet in the table (anti-join in DuckDB) - only those need details
+    ids = [f"{term}_{p['number']}" for p in all_processes]
+    new_ids = set(find_new(conn, "process", {"id": ids})["id"].to_pylist())
+    new_processes = [p for pid, p in zip(ids, all_processes) if pid in new_ids]
 
     if not new_processes:
         logger.info("All processes already exist")
         return
 
-    # Process in batches
-    process_rows = []
-    stage_rows = []
-
-    for proc in new_processes:
-        pid = f"{term}_{proc['number']}"
-
-        process_rows.append(
-            {
-                "id": pid,
-                "term_id": term,
-                "number": proc["number"],
-                "title": proc.get("title", ""),
-                "document_type": proc.get("documentType"),
-                "document_type_enum": proc.get("documentTypeEnum"),
-                "passed": proc.get("passed"),
-                "process_start_date": proc.get("processStartDate"),
-                "closure_date": proc.get("closureDate"),
-                "change_date": proc.get("changeDate"),
-                "description": proc.get("description"),
-                "title_final": proc.get("titleFinal"),
-            }
-        )
-
-        # Fetch detailed stages for linking to votings
-        details = await safe_request(client.process(term, proc["number"]), None)
-        if details is None:
-            logger.debug("Skipping process {} (API unavailable)", proc["number"])
-            await asyncio.sleep(0.05)
+    # Fetch detailed stages for linking to votings. Each batch's processes are inserted together
+    # with their stages in one transaction, so an interrupted run never leaves a process without
+    # stages (the anti-join above would skip it forever); processes whose details failed are
+    # left out and retried next sync.
+    total_processes = total_stages = 0
+
+    for i in range(0, len(new_processes), batch_size):
+        batch = new_processes[i : i + batch_size]
+        # Concurrent within a batch - the client semaphore does the throttling
+        details_list = await asyncio.gather(*[safe_request(client.process(term, p["number"]), {}) for p in batch])
+
+        fetched = []
+        stages = []  # (process_id, stage_index, stage)
+        for proc, details in zip(batch, details_list):
+            if not details:
+                logger.debug("Skipping process {} (API unavailable)", proc["number"])
+                continue
+
+            pid = f"{term}_{proc['number']}"
+            fetched.append(proc)
+            stages.extend((pid, idx, stage) for idx, stage in enumerate(flatten_stages(details.get("stages", []))))
+
+        if not fetched:
             continue
 
-        stages = details.get("stages", [])
-        for idx, stage in enumerate(flatten_stages(stages)):
-            stage_id = f"{pid}_{idx}"
-
-            # Try to find voting link
-            voting_id = None
-            if stage.get("voting"):
-                v = stage["voting"]
-                voting_id = f"{term}_{v.get('sitting')}_{v.get('votingNumber')}"
-
-            stage_rows.append(
-                {
-                    "id": stage_id,
-                    "process_id": pid,
-                    "stage_name": stage.get("stageName", ""),
-                    "stage_type": stage.get("stageType"),
-                    "date": stage.get("date"),
-                    "sitting_num": stage.get("sittingNum"),
-                    "decision": stage.get("decision"),
-                    "committee_code": stage.get("committeeCode"),
-                    "voting_id": voting_id,
-                }
-            )
-
-        await asyncio.sleep(0.05)
-
-    # Insert processes
-    if process_rows:
-        process_df = pl.DataFrame(process_rows)
-        conn.register("process_df", process_df)
-        conn.execute("INSERT INTO process SELECT * FROM process_df")
-        conn.unregister("process_df")
-        logger.info("Processes: +{} new", len(process_rows))
-
-    # Insert stages
-    if stage_rows:
-        stage_df = pl.DataFrame(stage_rows)
-        conn.register("stage_df", stage_df)
-        conn.execute("INSERT INTO process_stage SELECT * FROM stage_df")
-        conn.unregister("stage_df")
-        logger.info("Process stages: +{} new", len(stage_rows))
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            bulk_insert(conn, "process", _process_cols(term, fetched))
+            if stages:
+                bulk_insert(conn, "process_stage", _stage_cols(term, stages))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        total_processes += len(fetched)
+        total_stages += len(stages)
+
+    logger.info("Processes: +{} new", total_processes)
+    if total_stages:
+        logger.info("Process stages: +{} new", total_stages)
+
+
+def _process_cols(term: int, processes: list[dict]) -> dict[str, list]:
+    """Columnar `process` rows for API process records."""
+    return {
+        "id": [f"{term}_{p['number']}" for p in processes],
+        "term_id": [term] * len(processes),
+        "number": [p["number"] for p in processes],
+        "title": [p.get("title", "") for p in processes],
+        "document_type": [p.get("documentType") for p in processes],
+        "document_type_enum": [p.get("documentTypeEnum") for p in processes],
+        "passed": [p.get("passed") for p in processes],
+        "process_start_date": [p.get("processStartDate") for p in processes],
+        "closure_date": [p.get("closureDate") for p in processes],
+        "change_date": [p.get("changeDate") for p in processes],
+        "description": [p.get("description") for p in processes],
+        "title_final": [p.get("titleFinal") for p in processes],
+    }
+
+
+def _stage_cols(term: int, stages: list[tuple[str, int, dict]]) -> dict[str, list]:
+    """Columnar `process_stage` rows for (process_id, stage_index, stage) tuples."""
+    return {
+        "id": [f"{pid}_{idx}" for pid, idx, _ in stages],
+        "process_id": [pid for pid, _, _ in stages],
+        "stage_name": [st.get("stageName", "") for _, _, st in stages],
+        "stage_type": [st.get("stageType") for _, _, st in stages],
+        "date": [st.get("date") for _, _, st in stages],
+        "sitting_num": [st.get("sittingNum") for _, _, st in stages],
+        "decision": [st.get("decision") for _, _, st in stages],
+        "committee_code": [st.get("committeeCode") for _, _, st in stages],
+        "voting_id": [_stage_voting_id(term, st) for _, _, st in stages],
+    }
@@ -3,18 +3,19 @@
 import asyncio
 
 import duckdb
-import polars as pl
 from loguru import logger
 
-from app.repositories.db import init_tables
+from app.repositories.db import get_write_connection
 from etl.core import sync_core_data
+from etl.helpers import bulk_insert, get_existing_voting_ids
 from etl.legislation import sync_processes
 from etl.validation import validate_term
 from etl.voting import sync_votings
+from sejm_client import save_etag_cache
 from sejm_client.core import CoreClient
 from sejm_client.legislation import LegislationClient
 from sejm_client.voting import VotingClient
-from settings import DB_PATH
+from settings import ETL_DB_CONFIG, MAX_CONCURRENT
 
 
 async def sync_term(
@@ -22,24 +23,33 @@ async def sync_term(
     conn: duckdb.DuckDBPyConnection,
     batch_size: int = 50,
     force: bool = False,
+    existing_votes: set[tuple[int, int]] | None = None,
+    limiter: asyncio.Semaphore | None = None,
 ) -> None:
-    """Sync all data for a term incrementally."""
+    """Sync all data for a term incrementally.
+
+    `limiter` bounds in-flight API requests together with other terms synced concurrently.
+    """
     logger.info("Syncing term {}{}", term, " [FORCE]" if force else " [INCREMENTAL]")
+    client_args = {"max_concurrent": MAX_CONCURRENT, "limiter": limiter}
 
     # Sync core data (MPs, clubs, sittings)
-    async with CoreClient() as core_client:
+    async with CoreClient(**client_args) as core_client:
         sittings = await sync_core_data(core_client, term, conn)
 
     if not sittings:
         return
 
     # Sync votings
-    async with VotingClient() as voting_client:
-        await sync_votings(voting_client, term, conn, sittings, batch_size, force)
+    async with VotingClient(**client_args) as voting_client:
+        await sync_votings(voting_client, term, conn, sittings, batch_size, force, existing_votes)
 
     # Sync processes
-    async with LegislationClient() as legislation_client:
-        await sync_processes(legislation_client, term, conn)
+    async with LegislationClient(**client_args) as legislation_client:
+        await sync_processes(legislation_client, term, conn, batch_size)
+
+    # Persisted repository query results for this term are stale now
+    conn.execute("DELETE FROM analytics_cache WHERE term_id = ? AND starts_with(key, 'repo:')", [term])
 
     # Validation
     result = validate_term(conn, term)
@@ -55,36 +65,39 @@ async def _sync_async(
     force: bool,
 ) -> None:
     """Async sync implementation."""
-    conn = duckdb.connect(DB_PATH)
-    init_tables(conn)
+    conn = get_write_connection(ETL_DB_CONFIG)
+    # One request budget for the whole run, however many terms are synced at once
+    limiter = asyncio.Semaphore(MAX_CONCURRENT)
 
-    async with CoreClient() as client:
+    async with CoreClient(max_concurrent=MAX_CONCURRENT, limiter=limiter) as client:
         api_terms = await client.terms()
 
-        terms_df = pl.DataFrame(
-            [
-                {
-                    "id": t["num"],
-                    "from_date": t["from"],
-                    "to_date": t.get("to"),
-                    "current": t.get("current", False),
-                }
-                for t in api_terms
-            ]
-        )
+        terms_cols = {
+            "id": [t["num"] for t in api_terms],
+            "from_date": [t["from"] for t in api_terms],
+            "to_date": [t.get("to") for t in api_terms],
+            "current": [t.get("current", False) for t in api_terms],
+        }
         conn.execute("DELETE FROM term")
-        conn.register("terms_df", terms_df)
-        conn.execute("INSERT INTO term SELECT * FROM terms_df")
-        conn.unregister("terms_df")
+        bulk_insert(conn, "term", terms_cols)
 
         to_sync = [t for t in api_terms if terms is None or t["num"] in terms]
 
-    for t in to_sync:
+    # Votings that already have votes, for all terms at once
+    existing_votes = get_existing_voting_ids(conn, [t["num"] for t in to_sync]) if not force else {}
+
+    async def run(term: int) -> None:
+        # Own cursor per term: transactions held open across awaits must not interleave
+        cursor = conn.cursor()
         try:
-            await sync_term(t["num"], conn, batch_size, force)
+            await sync_term(term, cursor, batch_size, force, existing_votes.get(term), limiter)
         except Exception as e:
-            logger.error("Failed to sync term {}: {}", t["num"], e)
-            continue
+            logger.error("Failed to sync term {}: {}", term, e)
+        finally:
+            cursor.close()
+
+    # Terms are disjoint, so their API I/O overlaps; DuckDB writes still run one at a time on the loop
+    await asyncio.gather(*[run(t["num"]) for t in to_sync])
 
     conn.close()
     logger.info("Sync complete!")
@@ -96,4 +109,8 @@ def sync_all(
     force: bool = False,
 ) -> None:
     """Main sync entry point."""
-    asyncio.run(_sync_async(terms, batch_size, force))
+    try:
+        asyncio.run(_sync_async(terms, batch_size, force))
+    finally:
+        # Once per run rather than on every client exit
+        save_etag_cache()
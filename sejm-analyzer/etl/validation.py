@@ -3,70 +3,91 @@
 import duckdb
 
 
+def validate_terms(conn: duckdb.DuckDBPyConnection, terms: list[int]) -> list[dict]:
+    """Validate data integrity for several terms, in the order given."""
+    # All counts for all terms in one round-trip: each table is scanned once and grouped by term
+    rows = conn.execute(
+        """
+        WITH v AS (
+            SELECT id, term_id, yes, no, abstain, not_voting FROM voting WHERE list_contains($terms, term_id)
+        ),
+        vote_counts AS (
+            SELECT vote.voting_id, COUNT(*) AS n
+            FROM vote JOIN v ON vote.voting_id = v.id
+            GROUP BY vote.voting_id
+        ),
+        voting_stats AS (
+            SELECT
+                v.term_id,
+                COUNT(*) AS votings,
+                COUNT(*) FILTER (WHERE v.yes + v.no + v.abstain + v.not_voting = 0) AS empty_votings,
+                COUNT(*) FILTER (WHERE vc.n IS NULL AND v.yes + v.no > 0) AS missing_votes,
+                COALESCE(SUM(vc.n), 0) AS votes,
+                COUNT(vc.n) AS with_votes
+            FROM v LEFT JOIN vote_counts vc ON vc.voting_id = v.id
+            GROUP BY v.term_id
+        ),
+        mp_stats AS (
+            SELECT term_id, COUNT(*) AS mps FROM mp WHERE list_contains($terms, term_id) GROUP BY term_id
+        ),
+        process_stats AS (
+            SELECT term_id, COUNT(*) AS processes FROM process WHERE list_contains($terms, term_id) GROUP BY term_id
+        )
+        SELECT
+            t.term_id,
+            COALESCE(m.mps, 0),
+            COALESCE(vs.votings, 0),
+            COALESCE(vs.empty_votings, 0),
+            COALESCE(vs.missing_votes, 0),
+            COALESCE(vs.votes, 0),
+            COALESCE(vs.with_votes, 0),
+            COALESCE(p.processes, 0)
+        FROM (SELECT UNNEST($terms) AS term_id) t
+        LEFT JOIN mp_stats m ON m.term_id = t.term_id
+        LEFT JOIN voting_stats vs ON vs.term_id = t.term_id
+        LEFT JOIN process_stats p ON p.term_id = t.term_id
+        """,
+        {"terms": list(terms)},
+    ).fetchall()
+    by_term = {row[0]: row[1:] for row in rows}
+
+    return [_term_result(term, *by_term[term]) for term in terms]
+
+
 def validate_term(conn: duckdb.DuckDBPyConnection, term: int) -> dict:
     """Validate data integrity for a term."""
+    return validate_terms(conn, [term])[0]
+
+
+def _term_result(
+    term: int,
+    mps: int,
+    votings: int,
+    empty_votings: int,
+    missing_votes: int,
+    votes: int,
+    with_votes: int,
+    processes: int,
+) -> dict:
+    """Turn a term's counts into its validation result."""
     issues = []
     stats = {}
 
-    mp_count = conn.execute("SELECT COUNT(*) FROM mp WHERE term_id = ?", [term]).fetchone()[0]
-    stats["mps"] = mp_count
-    if mp_count == 0:
+    stats["mps"] = mps
+    if mps == 0:
         issues.append("No MPs found")
 
-    voting_check = conn.execute(
-        """
-        SELECT
-            COUNT(*) as total_votings,
-            SUM(CASE WHEN yes + no + abstain + not_voting = 0 THEN 1 ELSE 0 END) as empty
-        FROM voting WHERE term_id = ?
-        """,
-        [term],
-    ).fetchone()
-    stats["votings"] = voting_check[0] or 0
-    empty_votings = voting_check[1] or 0
+    stats["votings"] = votings
     if empty_votings > 0:
         issues.append(f"{empty_votings} votings have zero votes in summary")
 
-    vote_check = conn.execute(
-        """
-        SELECT COUNT(*) FROM voting v
-        LEFT JOIN vote ON vote.voting_id = v.id
-        WHERE v.term_id = ? AND vote.id IS NULL AND v.yes + v.no > 0
-        """,
-        [term],
-    ).fetchone()[0]
-    stats["votings_missing_votes"] = vote_check
-    if vote_check > 0:
-        issues.append(f"{vote_check} votings have no individual votes loaded")
-
-    vote_count = conn.execute(
-        """
-        SELECT COUNT(*) FROM vote
-        JOIN voting v ON vote.voting_id = v.id
-        WHERE v.term_id = ?
-        """,
-        [term],
-    ).fetchone()[0]
-    stats["votes"] = vote_count
-
-    process_count = conn.execute("SELECT COUNT(*) FROM process WHERE term_id = ?", [term]).fetchone()[0]
-    stats["processes"] = process_count
+    stats["votings_missing_votes"] = missing_votes
+    if missing_votes > 0:
+        issues.append(f"{missing_votes} votings have no individual votes loaded")
 
-    coverage_check = conn.execute(
-        """
-        SELECT
-            COUNT(DISTINCT v.id) as total,
-            COUNT(DISTINCT CASE WHEN vote.id IS NOT NULL THEN v.id END) as with_votes
-        FROM voting v
-        LEFT JOIN vote ON vote.voting_id = v.id
-        WHERE v.term_id = ?
-        """,
-        [term],
-    ).fetchone()
-    if coverage_check and coverage_check[0]:
-        stats["coverage_pct"] = round(coverage_check[1] / coverage_check[0] * 100, 1)
-    else:
-        stats["coverage_pct"] = 0
+    stats["votes"] = int(votes)
+    stats["processes"] = processes
+    stats["coverage_pct"] = round(with_votes / votings * 100, 1) if votings else 0
 
     return {
         "term": term,
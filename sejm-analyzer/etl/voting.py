@@ -4,33 +4,37 @@ import asyncio
 from datetime import datetime
 
 import duckdb
-import polars as pl
 from loguru import logger
 
-from etl.helpers import get_existing_ids, get_existing_voting_ids
+from etl.helpers import bulk_insert, get_existing_voting_ids, insert_new
 from sejm_client import safe_request
 from sejm_client.voting import VotingClient
 
 BATCH_DELAY = 2.0
+# Buffer votes across batches and flush in large appends
+VOTE_FLUSH_ROWS = 100_000
 
 
-async def fetch_votes(client: VotingClient, term: int, sitting: int, voting: int, vid: str) -> list:
-    """Fetch individual votes for a voting."""
+async def fetch_votes(client: VotingClient, term: int, sitting: int, voting: int, vid: str) -> tuple[str, list[dict]]:
+    """Fetch individual votes for a voting (raw API records), tagged with its voting ID."""
     try:
         details = await client.voting(term, sitting, voting)
-        return [
-            (
-                f"{vid}_{v.get('MP')}",
-                vid,
-                f"{term}_{v.get('MP')}",
-                v.get("club"),
-                v.get("vote", "NO_VOTE"),
-            )
-            for v in details.get("votes", [])
-        ]
+        return vid, details.get("votes", [])
     except Exception as e:
         logger.warning("Failed votes {}: {}", vid, e)
-        return []
+        return vid, []
+
+
+def append_votes(cols: dict[str, list], term: int, vid: str, votes: list[dict]) -> None:
+    """Append a voting's votes to columnar `vote` table buffers."""
+    # Hoisted prefixes: per-vote keys are then a single concatenation
+    vid_prefix, term_prefix = f"{vid}_", f"{term}_"
+    mps = [str(v.get("MP")) for v in votes]
+    cols["id"].extend([vid_prefix + mp for mp in mps])
+    cols["voting_id"].extend([vid] * len(votes))
+    cols["mp_id"].extend([term_prefix + mp for mp in mps])
+    cols["club"].extend([v.get("club") for v in votes])
+    cols["vote"].extend([v.get("vote", "NO_VOTE") for v in votes])
 
 
 async def sync_votings(
@@ -40,49 +44,54 @@ async def sync_votings(
     sittings: list,
     batch_size: int,
     force: bool,
+    existing_votes: set[tuple[int, int]] | None = None,
 ) -> None:
-    """Sync votings and votes for a term."""
-    existing_votings = get_existing_ids(conn, "voting", term)
-    existing_votes = get_existing_voting_ids(conn, term) if not force else set()
+    """Sync votings and votes for a term.
+
+    `existing_votes` are (sitting_num, voting_num) of votings that already have votes loaded;
+    looked up if not given.
+    """
+    if force:
+        # Cold start: the term's votings are dropped with the voting insert below, so everything reloads
+        existing_votes = set()
+    elif existing_votes is None:
+        existing_votes = get_existing_voting_ids(conn, [term])[term]
 
     logger.info("Checking {} sittings for new votings...", len(sittings))
-    new_votings, voting_ids_to_fetch = [], []
+    # Keyed by voting ID: a voting listed twice is inserted and fetched only once
+    listed_votings: dict[str, tuple[int, dict]] = {}
+    to_fetch: dict[str, tuple[int, int]] = {}
+    term_prefix = f"{term}_"
+
+    # Fetch all sittings concurrently - the client semaphore does the throttling
+    results = await asyncio.gather(*[safe_request(client.votings(term, p["number"]), []) for p in sittings])
 
-    for p in sittings:
-        votings = await safe_request(client.votings(term, p["number"]), [])
+    for p, votings in zip(sittings, results):
+        sitting = p["number"]
+        sitting_prefix = f"{term_prefix}{sitting}_"
         for v in votings:
-            vid = f"{term}_{p['number']}_{v['votingNumber']}"
-
-            if vid in existing_votings and not force:
-                if vid not in existing_votes:
-                    voting_ids_to_fetch.append((p["number"], v["votingNumber"], vid))
-                continue
-
-            voting_ids_to_fetch.append((p["number"], v["votingNumber"], vid))
-            new_votings.append(
-                {
-                    "id": vid,
-                    "sitting_id": f"{term}_{p['number']}",
-                    "term_id": term,
-                    "sitting_num": p["number"],
-                    "voting_num": v["votingNumber"],
-                    "date": datetime.fromisoformat(v["date"]),
-                    "title": v["title"],
-                    "topic": v.get("topic"),
-                    "yes": v.get("yes", 0),
-                    "no": v.get("no", 0),
-                    "abstain": v.get("abstain", 0),
-                    "not_voting": v.get("notParticipating", 0),
-                }
-            )
-        await asyncio.sleep(0.05)
-
-    if new_votings:
-        votings_df = pl.DataFrame(new_votings)
-        conn.register("votings_df", votings_df)
-        conn.execute("INSERT INTO voting SELECT * FROM votings_df")
-        conn.unregister("votings_df")
-        logger.info("Votings: +{} new", len(new_votings))
+            key = (sitting, v["votingNumber"])
+            vid = sitting_prefix + str(key[1])
+            listed_votings[vid] = (sitting, v)
+            if key not in existing_votes:
+                to_fetch[vid] = key
+
+    # Votings already in the table are skipped by the anti-join in insert_new. A forced re-sync drops
+    # the term's votes and votings in the same transaction, so an interrupted run never leaves it half-deleted
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        if force:
+            conn.execute("DELETE FROM vote WHERE voting_id IN (SELECT id FROM voting WHERE term_id = ?)", [term])
+            conn.execute("DELETE FROM voting WHERE term_id = ?", [term])
+        added = insert_new(conn, "voting", _voting_cols(term, listed_votings)) if listed_votings else []
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    if listed_votings:
+        logger.info("Votings: +{} new", len(added))
+
+    voting_ids_to_fetch = [(s, n, vid) for vid, (s, n) in to_fetch.items()]
 
     if not voting_ids_to_fetch:
         logger.info("Votes: all {} already loaded", len(existing_votes))
@@ -90,33 +99,62 @@ async def sync_votings(
 
     # Fetch individual votes
     logger.info("Fetching votes for {} votings...", len(voting_ids_to_fetch))
-    all_votes = []
+    total_votes = 0
+    pending_votes: dict[str, list] = {"id": [], "voting_id": [], "mp_id": [], "club": [], "vote": []}
+
+    def flush() -> None:
+        bulk_insert(conn, "vote", pending_votes)
+        logger.debug("Inserted {} votes", len(pending_votes["id"]))
+        for col in pending_votes.values():
+            col.clear()
+
     total_batches = (len(voting_ids_to_fetch) + batch_size - 1) // batch_size
 
-    for i in range(0, len(voting_ids_to_fetch), batch_size):
-        batch = voting_ids_to_fetch[i : i + batch_size]
-        batch_num = i // batch_size + 1
-        logger.info("Batch {}/{}", batch_num, total_batches)
-
-        results = await asyncio.gather(*[fetch_votes(client, term, s, v, vid) for s, v, vid in batch])
-
-        batch_votes = []
-        for votes in results:
-            batch_votes.extend(votes)
-
-        if batch_votes:
-            votes_df = pl.DataFrame(
-                batch_votes,
-                schema=["id", "voting_id", "mp_id", "club", "vote"],
-                orient="row",
-            )
-            conn.register("votes_df", votes_df)
-            conn.execute("INSERT INTO vote SELECT * FROM votes_df")
-            conn.unregister("votes_df")
-            all_votes.extend(batch_votes)
-            logger.debug("Batch {}: inserted {} votes", batch_num, len(batch_votes))
-
-        if i + batch_size < len(voting_ids_to_fetch):
-            await asyncio.sleep(BATCH_DELAY)
-
-    logger.info("Votes: +{} new", len(all_votes))
+    # Single transaction for the whole vote load - one commit instead of one per flush
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        for i in range(0, len(voting_ids_to_fetch), batch_size):
+            batch = voting_ids_to_fetch[i : i + batch_size]
+            batch_num = i // batch_size + 1
+            logger.info("Batch {}/{}", batch_num, total_batches)
+
+            # Consume votings as they arrive so flushes overlap with requests still in flight
+            for fut in asyncio.as_completed([fetch_votes(client, term, s, v, vid) for s, v, vid in batch]):
+                vid, votes = await fut
+                append_votes(pending_votes, term, vid, votes)
+                total_votes += len(votes)
+
+                if len(pending_votes["id"]) >= VOTE_FLUSH_ROWS:
+                    flush()
+
+            if i + batch_size < len(voting_ids_to_fetch):
+                await asyncio.sleep(BATCH_DELAY)
+
+        if pending_votes["id"]:
+            flush()
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    logger.info("Votes: +{} new", total_votes)
+
+
+def _voting_cols(term: int, listed_votings: dict[str, tuple[int, dict]]) -> dict[str, list]:
+    """Columnar `voting` rows for votings keyed by ID as (sitting_num, voting)."""
+    term_prefix = f"{term}_"
+    rows = [(vid, s, v) for vid, (s, v) in listed_votings.items()]
+    return {
+        "id": [vid for vid, _, _ in rows],
+        "sitting_id": [term_prefix + str(s) for _, s, _ in rows],
+        "term_id": [term] * len(rows),
+        "sitting_num": [s for _, s, _ in rows],
+        "voting_num": [v["votingNumber"] for _, _, v in rows],
+        "date": [datetime.fromisoformat(v["date"]) for _, _, v in rows],
+        "title": [v["title"] for _, _, v in rows],
+        "topic": [v.get("topic") for _, _, v in rows],
+        "yes": [v.get("yes", 0) for _, _, v in rows],
+        "no": [v.get("no", 0) for _, _, v in rows],
+        "abstain": [v.get("abstain", 0) for _, _, v in rows],
+        "not_voting": [v.get("notParticipating", 0) for _, _, v in rows],
+    }
@@ -1,9 +1,47 @@
-"""Pure math formulas - no dependencies, easily testable."""
+"""Pure math formulas - no app dependencies, easily testable."""
 
-from collections import defaultdict
-from itertools import combinations, permutations
 from math import factorial
 
+import numpy as np
+
+# Factorial lookup for power-index weighting (covers any realistic number of parties)
+_FACT = [factorial(i) for i in range(33)]
+# Set bits per byte value, for popcounts over np.packbits arrays
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def _swings_by_size(weights: list[int], quota: int) -> list[list[int]]:
+    """Swing counts per party: result[i][k] = size-k coalitions of the others that party i turns winning.
+
+    Subset-sum DP over (size, seats), only tracking seat sums below the quota - O(n²·quota)
+    instead of enumerating coalitions or orderings.
+    """
+    n = len(weights)
+    if quota <= 0:
+        return [[0] * n for _ in weights]
+
+    # dp[k][s] = number of size-k coalitions (of all parties) with s < quota seats
+    dp = [[0] * quota for _ in range(n + 1)]
+    dp[0][0] = 1
+    for j, w in enumerate(weights):
+        for k in range(j + 1, 0, -1):
+            prev, cur = dp[k - 1], dp[k]
+            for s in range(quota - 1, w - 1, -1):
+                cur[s] += prev[s - w]
+
+    result = []
+    for w in weights:
+        # Take party out again: without[k][s] = dp[k][s] - without[k-1][s-w]
+        without = [dp[0]]
+        for k in range(1, n):
+            row, prev = dp[k][:], without[k - 1]
+            for s in range(w, quota):
+                row[s] -= prev[s - w]
+            without.append(row)
+        lo = max(quota - w, 0)
+        result.append([sum(row[lo:]) for row in without])
+    return result
+
 
 def shapley_shubik(seats: dict[str, int], quota: int) -> dict[str, float]:
     """Shapley-Shubik power index."""
@@ -13,16 +51,13 @@ def shapley_shubik(seats: dict[str, int], quota: int) -> dict[str, float]:
     if n <= 1:
         return {parties[0]: 1.0} if n == 1 else {}
 
-    total = factorial(n)
-    counts = dict.fromkeys(parties, 0)
-
-    for perm in permutations(parties):
-        cumsum = 0
-        for party in perm:
-            if cumsum < quota <= cumsum + seats[party]:
-                counts[party] += 1
-                break
-            cumsum += seats[party]
+    # Party is pivotal in k!·(n-1-k)! orderings for each size-k coalition it swings
+    fact = _FACT if n < len(_FACT) else [factorial(i) for i in range(n + 1)]
+    total = fact[n]
+    swings = _swings_by_size([seats[p] for p in parties], quota)
+    counts = {
+        p: sum(c * fact[k] * fact[n - 1 - k] for k, c in enumerate(by_size)) for p, by_size in zip(parties, swings)
+    }
 
     return {p: c / total for p, c in counts.items()}
 
@@ -35,18 +70,8 @@ def banzhaf(seats: dict[str, int], quota: int) -> dict[str, float]:
     if n <= 1:
         return {parties[0]: 1.0} if n == 1 else {}
 
-    swings = dict.fromkeys(parties, 0)
-
-    for r in range(n + 1):
-        for coal in combinations(parties, r):
-            coal_set, coal_votes = set(coal), sum(seats[p] for p in coal)
-
-            for party in parties:
-                if party in coal_set:
-                    if coal_votes >= quota > coal_votes - seats[party]:
-                        swings[party] += 1
-                elif coal_votes < quota <= coal_votes + seats[party]:
-                    swings[party] += 1
+    # Each swing coalition of the others, regardless of size
+    swings = {p: sum(by_size) for p, by_size in zip(parties, _swings_by_size([seats[p] for p in parties], quota))}
 
     total = sum(swings.values()) or 1
     return {p: c / total for p, c in swings.items()}
@@ -55,32 +80,30 @@ def banzhaf(seats: dict[str, int], quota: int) -> dict[str, float]:
 def min_coalitions(seats: dict[str, int], quota: int, max_size: int = 5) -> list[tuple]:
     """Minimal winning coalitions. Returns [(parties, seats, surplus)]."""
     parties = list(seats.keys())
+    # Largest first: the last party added is always the smallest member, so a winning
+    # coalition is minimal iff dropping that one loses, and shorter tails can be pruned
+    order = sorted(range(len(parties)), key=lambda i: -seats[parties[i]])
+    weights = [seats[parties[i]] for i in order]
     result = []
 
-    for size in range(1, min(max_size + 1, len(parties) + 1)):
-        for combo in combinations(parties, size):
-            total = sum(seats[p] for p in combo)
-            if total >= quota and all(total - seats[p] < quota for p in combo):
-                result.append((frozenset(combo), total, total - quota))
+    def walk(start: int, chosen: list[int], total: int) -> None:
+        slots = max_size - len(chosen)
+        for j in range(start, len(order)):
+            w = weights[j]
+            if total + w * slots < quota:
+                break  # remaining parties are no larger - can't reach quota
+            if total + w >= quota:
+                if total < quota:
+                    result.append((tuple(sorted([*chosen, order[j]])), total + w))
+            elif slots > 1:
+                walk(j + 1, [*chosen, order[j]], total + w)
 
-    largest = max(parties, key=lambda p: seats[p])
-    if seats[largest] >= quota:
-        others = [p for p in parties if p != largest]
-        for size in range(2, min(max_size + 1, len(others) + 1)):
-            for combo in combinations(others, size):
-                total = sum(seats[p] for p in combo)
-                if total >= quota and all(total - seats[p] < quota for p in combo):
-                    result.append((frozenset(combo), total, total - quota))
+    if max_size > 0:
+        walk(0, [], 0)
 
-    seen = set()
-    unique = []
-    for item in sorted(result, key=lambda x: (x[2], len(x[0]))):
-        key = item[0]
-        if key not in seen:
-            seen.add(key)
-            unique.append(item)
-
-    return unique[:15]
+    # Least surplus first, then smaller coalitions, then input order
+    result.sort(key=lambda x: (x[1] - quota, len(x[0]), x[0]))
+    return [(frozenset(parties[i] for i in idx), total, total - quota) for idx, total in result[:15]]
 
 
 def rice_index(yes: int, no: int) -> float:
@@ -94,34 +117,83 @@ def average_rice(votes: list[tuple[int, int]]) -> float:
     return sum(rice_index(y, n) for y, n in votes) / len(votes) if votes else 0.0
 
 
-def agreement_rate(a: list[bool], b: list[bool]) -> float:
+def average_rice_vec(yn: np.ndarray) -> float:
+    """Average Rice index over an (N, 2) array of (yes, no) counts."""
+    if not len(yn):
+        return 0.0
+    yn = np.asarray(yn)
+    total = yn.sum(axis=1)
+    return float((np.abs(yn[:, 0] - yn[:, 1]) / np.maximum(total, 1)).mean())
+
+
+def average_rice_grouped(yn: np.ndarray, groups: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Average Rice index per group in one pass: (averages, row counts), groups given as 0..n_groups-1 codes."""
+    yn = np.asarray(yn)
+    rice = np.abs(yn[:, 0] - yn[:, 1]) / np.maximum(yn.sum(axis=1), 1)
+    counts = np.bincount(groups, minlength=n_groups)
+    sums = np.bincount(groups, weights=rice, minlength=n_groups)
+    return np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0), counts
+
+
+def agreement_rate(a: list[bool] | np.ndarray, b: list[bool] | np.ndarray) -> float:
     """How often two vote the same (0-100%)."""
-    if not a or len(a) != len(b):
+    a, b = np.asarray(a), np.asarray(b)
+    if not a.size or a.shape != b.shape:
         return 0.0
-    return sum(x == y for x, y in zip(a, b)) / len(a) * 100
+    return np.count_nonzero(a == b) / a.size * 100
+
+
+def pairwise_agreement(present: np.ndarray, yes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise counts of shared votes and of shared votes with the same decision.
+
+    `present` and `yes` are bool (voter x voting) matrices. Rows are packed to bits so each
+    pair costs a popcount over len/8 bytes. Returns (both, agree) as symmetric (voter x voter)
+    matrices; only pairs i <= j are counted and then mirrored.
+    """
+    present = np.asarray(present, dtype=bool)
+    p = np.packbits(present, axis=1)
+    y = np.packbits(np.asarray(yes, dtype=bool) & present, axis=1)
+    i, j = np.triu_indices(len(p))
+    shared = p[i] & p[j]
+    same = shared & ~(y[i] ^ y[j])
+
+    both = np.zeros((len(p), len(p)), dtype=np.int64)
+    agree = np.zeros_like(both)
+    both[i, j] = both[j, i] = _POPCOUNT8[shared].sum(axis=1)
+    agree[i, j] = agree[j, i] = _POPCOUNT8[same].sum(axis=1)
+    return both, agree
 
 
 def transition_matrix(sequence: list[str]) -> dict[str, float]:
     """Voting transition probabilities."""
-    seq = [v for v in sequence if v in ("YES", "NO")]
+    trans = transition_stats(sequence)
+    return {k: trans[k] for k in ("yes_to_yes", "yes_to_no", "no_to_yes", "no_to_no")}
+
+
+def transition_stats(sequence: list[str] | list[bool] | np.ndarray) -> dict[str, float]:
+    """Transition probabilities plus momentum and volatility, from one pass over the sequence.
 
-    if len(seq) < 2:
-        return {"yes_to_yes": 0, "yes_to_no": 0, "no_to_yes": 0, "no_to_no": 0}
+    Accepts "YES"/"NO" strings (others are skipped) or already-encoded booleans (True = YES).
+    """
+    seq = np.asarray(sequence)
+    yes = seq if seq.dtype == bool else seq[(seq == "YES") | (seq == "NO")] == "YES"
 
-    counts = defaultdict(lambda: defaultdict(int))
-    for i in range(len(seq) - 1):
-        counts[seq[i]][seq[i + 1]] += 1
+    if len(yes) < 2:
+        return {"yes_to_yes": 0, "yes_to_no": 0, "no_to_yes": 0, "no_to_no": 0, "momentum": 0, "volatility": 0}
 
-    def prob(f, t):
-        total = sum(counts[f].values())
-        return counts[f][t] / total if total else 0
+    # Transition codes (prev << 1) | cur: 0=NO->NO, 1=NO->YES, 2=YES->NO, 3=YES->YES
+    counts = np.bincount((yes[:-1].astype(np.uint8) << 1) | yes[1:], minlength=4)
+    from_no, from_yes = counts[0] + counts[1], counts[2] + counts[3]
 
-    return {
-        "yes_to_yes": prob("YES", "YES"),
-        "yes_to_no": prob("YES", "NO"),
-        "no_to_yes": prob("NO", "YES"),
-        "no_to_no": prob("NO", "NO"),
+    trans = {
+        "yes_to_yes": float(counts[3] / from_yes) if from_yes else 0,
+        "yes_to_no": float(counts[2] / from_yes) if from_yes else 0,
+        "no_to_yes": float(counts[1] / from_no) if from_no else 0,
+        "no_to_no": float(counts[0] / from_no) if from_no else 0,
     }
+    trans["momentum"] = momentum(trans)
+    trans["volatility"] = volatility(trans)
+    return trans
 
 
 def momentum(trans: dict) -> float:
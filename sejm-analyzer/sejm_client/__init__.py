@@ -1,6 +1,6 @@
 """Sejm API client package."""
 
-from sejm_client.base import BaseClient, safe_request, set_api_config
+from sejm_client.base import BaseClient, safe_request, save_etag_cache, set_api_config
 from sejm_client.core import CoreClient
 from sejm_client.legislation import LegislationClient
 from sejm_client.voting import VotingClient
@@ -9,6 +9,7 @@ __all__ = [
     # Base
     "BaseClient",
     "safe_request",
+    "save_etag_cache",
     "set_api_config",
     # Clients
     "CoreClient",
@@ -1,11 +1,16 @@
 """Base HTTP client with retry logic."""
 
 import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
 
 import httpx
+import orjson
 from loguru import logger
 from tenacity import (
     retry,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
@@ -14,55 +19,135 @@ from tenacity import (
 API_BASE_URL = "https://api.sejm.gov.pl/sejm"
 API_TIMEOUT = 60
 
+# Conditional GET cache (path -> (etag, body)), shared by all clients and persisted across runs
+ETAG_CACHE_PATH: Path | None = Path(".cache") / "etags.json"
+ETAG_CACHE_SIZE = 2000
 
-def set_api_config(base_url: str, timeout: int) -> None:
-    """Set API configuration."""
-    global API_BASE_URL, API_TIMEOUT
+_etag_cache: OrderedDict[str, tuple[str, Any]] | None = None
+
+
+def set_api_config(base_url: str, timeout: int, etag_cache_path: Path | None = ETAG_CACHE_PATH) -> None:
+    """Set API configuration (etag_cache_path=None disables ETag persistence)."""
+    global API_BASE_URL, API_TIMEOUT, ETAG_CACHE_PATH
     API_BASE_URL = base_url
     API_TIMEOUT = timeout
+    ETAG_CACHE_PATH = etag_cache_path
+
+
+def _load_etag_cache() -> OrderedDict[str, tuple[str, Any]]:
+    """Load the ETag cache from disk once per process."""
+    global _etag_cache
+    if _etag_cache is None:
+        _etag_cache = OrderedDict()
+        if ETAG_CACHE_PATH and ETAG_CACHE_PATH.exists():
+            try:
+                _etag_cache.update((k, tuple(v)) for k, v in orjson.loads(ETAG_CACHE_PATH.read_bytes()).items())
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable ETag cache {}: {}", ETAG_CACHE_PATH, e)
+    return _etag_cache
+
+
+def save_etag_cache() -> None:
+    """Persist the ETag cache to disk - once per run, after all clients are done.
+
+    Written to a temp file and renamed over the old one, so an interrupted save never leaves a torn cache.
+    """
+    if _etag_cache is None or ETAG_CACHE_PATH is None:
+        return
+    ETAG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ETAG_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps(_etag_cache))
+    tmp.replace(ETAG_CACHE_PATH)
 
 
 def _is_retryable_error(exc: BaseException) -> bool:
-    """Check if exception is retryable (network errors + 5xx server errors)."""
+    """Check if exception is retryable (network errors + 429 / 5xx server errors)."""
     if isinstance(exc, (httpx.ReadError, httpx.ConnectError, httpx.TimeoutException)):
         return True
-    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+    return isinstance(exc, httpx.HTTPStatusError) and (
+        exc.response.status_code == 429 or exc.response.status_code >= 500
+    )
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds form), if any."""
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
 
 
 class BaseClient:
     """Base async HTTP client with rate limiting and exponential backoff."""
 
-    def __init__(self, max_concurrent: int = 20):
+    def __init__(self, max_concurrent: int = 64, limiter: asyncio.Semaphore | None = None):
+        """`limiter` caps in-flight requests across several clients sharing it (default: per client)."""
         self._client: httpx.AsyncClient | None = None
-        self._sem = asyncio.Semaphore(max_concurrent)
+        self._max_concurrent = max_concurrent
+        self._sem = limiter or asyncio.Semaphore(max_concurrent)
+        self._resume_at = 0.0  # loop time before which no request is sent (server asked us to back off)
         self._request_count = 0
+        self._not_modified_count = 0
+        self._etags = _load_etag_cache()
         logger.info("{}: max_concurrent={}", self.__class__.__name__, max_concurrent)
 
     async def __aenter__(self):
+        # HTTP/2 multiplexes concurrent requests over one connection to the API host
         self._client = httpx.AsyncClient(
+            http2=True,
             timeout=API_TIMEOUT,
-            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            limits=httpx.Limits(
+                max_connections=self._max_concurrent,
+                max_keepalive_connections=self._max_concurrent,
+            ),
         )
         return self
 
     async def __aexit__(self, *_):
-        logger.info("Total API requests: {}", self._request_count)
+        logger.info("Total API requests: {} ({} not modified)", self._request_count, self._not_modified_count)
         if self._client:
             await self._client.aclose()
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=30),
-        retry=_is_retryable_error,
+        retry=retry_if_exception(_is_retryable_error),
     )
-    async def _get(self, path: str) -> dict | list:
-        """GET request with retry logic."""
+    async def _get(self, path: str, conditional: bool = True) -> dict | list:
+        """GET request with retry logic.
+
+        With `conditional`, sends If-None-Match for previously seen paths and serves
+        the cached body on 304 Not Modified. Pacing is left to the semaphore, except
+        when the server sends Retry-After - then all requests pause until it passes.
+        """
         async with self._sem:
-            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            if (delay := self._resume_at - loop.time()) > 0:
+                await asyncio.sleep(delay)
             self._request_count += 1
-            resp = await self._client.get(f"{API_BASE_URL}/{path}")
+            cached = self._etags.get(path) if conditional else None
+            headers = {"If-None-Match": cached[0]} if cached else None
+            resp = await self._client.get(f"{API_BASE_URL}/{path}", headers=headers)
+
+            if cached and resp.status_code == 304:
+                self._not_modified_count += 1
+                self._etags.move_to_end(path)
+                return cached[1]
+
+            if resp.status_code in (429, 503) and (wait := _retry_after(resp)):
+                logger.warning("Rate limited on {}, pausing {}s", path, wait)
+                self._resume_at = max(self._resume_at, loop.time() + wait)
+
             resp.raise_for_status()
-            return resp.json()
+            data = orjson.loads(resp.content)  # faster than the stdlib json behind resp.json()
+
+            etag = resp.headers.get("ETag")
+            if conditional and etag:
+                self._etags[path] = (etag, data)
+                self._etags.move_to_end(path)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+            return data
 
 
 async def safe_request(coro, default=None):
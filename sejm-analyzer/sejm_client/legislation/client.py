@@ -16,7 +16,8 @@ class LegislationClient(BaseClient):
 
     async def process(self, term: int, number: str) -> dict:
         """GET /sejm/term{term}/processes/{num} - process details."""
-        return await self._get(f"term{term}/processes/{number}")
+        # Fetched once per new process - not worth an ETag entry
+        return await self._get(f"term{term}/processes/{number}", conditional=False)
 
     async def prints(self, term: int) -> list[dict]:
         """GET /sejm/term{term}/prints - sejm prints."""
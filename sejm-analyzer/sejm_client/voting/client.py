@@ -12,4 +12,5 @@ class VotingClient(BaseClient):
 
     async def voting(self, term: int, sitting: int, voting: int) -> dict:
         """GET /sejm/term{term}/votings/{sitting}/{voting} - voting details."""
-        return await self._get(f"term{term}/votings/{sitting}/{voting}")
+        # Fetched once per voting (only when votes are missing) - not worth an ETag entry
+        return await self._get(f"term{term}/votings/{sitting}/{voting}", conditional=False)
@@ -14,6 +14,17 @@ API_BASE_URL = "https://api.sejm.gov.pl/sejm"
 API_TIMEOUT = 60
 
 # Sync
-MAX_CONCURRENT = 20
+MAX_CONCURRENT = 64
 BATCH_SIZE = 50
 BATCH_DELAY = 1.0
+
+# DuckDB settings for the write-heavy sync connection
+ETL_DB_CONFIG = {
+    "threads": os.cpu_count() or 4,
+    "memory_limit": os.getenv("SEJM_ETL_MEMORY_LIMIT", "8GB"),
+    "checkpoint_threshold": "1GB",  # checkpoint rarely during bulk loads
+    "preserve_insertion_order": False,
+}
+
+# Analytics precompute (process pool size, one term per worker)
+PRECOMPUTE_WORKERS = 4
@@ -12,22 +12,24 @@ Usage:
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
 
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import duckdb
+from loguru import logger
 
-from app.repositories import CacheRepository, MpRepository, VotingRepository
+from app.repositories import CacheRepository, MpRepository, ProcessRepository, VotingRepository, close_db
+from app.services.legislation.topic_modeling import TopicModeling
 from app.services.voting.analytics import VotingAnalytics
 from etl import sync_all
-from etl.validation import validate_term
-from settings import BATCH_SIZE, DB_PATH, MAX_CONCURRENT
+from etl.validation import validate_terms
+from settings import BATCH_SIZE, DB_PATH, MAX_CONCURRENT, PRECOMPUTE_WORKERS
 from settings.logging import setup_logging
 
-logger = setup_logging(level="INFO", to_file=True)
-
 
 def run_validation(terms: list[int] | None = None):
     """Validate terms in database."""
@@ -50,8 +52,8 @@ def run_validation(terms: list[int] | None = None):
     print("=" * 60)
 
     all_valid = True
-    for term in all_terms:
-        result = validate_term(conn, term)
+    for result in validate_terms(conn, all_terms):
+        term = result["term"]
         status = "✅" if result["valid"] else "❌"
         print(f"\nTerm {term} {status}")
         print(f"  MPs: {result['stats']['mps']:,}")
@@ -76,12 +78,16 @@ def run_validation(terms: list[int] | None = None):
     return all_valid
 
 
+def _compute_term(term_id: int) -> dict:
+    """Compute all analytics for a term in a worker process (read-only DB)."""
+    analytics = VotingAnalytics(voting_repo=VotingRepository(), mp_repo=MpRepository(), cache_repo=CacheRepository())
+    logger.info("Computing analytics for term {}...", term_id)
+    return analytics.compute_all(term_id)
+
+
 def precompute_analytics(terms: list[int] | None = None, force: bool = False):
-    """Precompute and cache analytics for terms."""
+    """Precompute and cache analytics for terms (terms are computed in parallel)."""
     mp_repo = MpRepository()
-    voting_repo = VotingRepository()
-    cache_repo = CacheRepository(read_only=False)
-    analytics = VotingAnalytics(voting_repo=voting_repo, mp_repo=mp_repo, cache_repo=cache_repo)
 
     if terms is None:
         terms = mp_repo.get_terms()
@@ -90,6 +96,12 @@ def precompute_analytics(terms: list[int] | None = None, force: bool = False):
     terms_data = mp_repo.get_terms_with_data()
     terms_with_voting = terms_data["voting"]
 
+    # Thread-local connection was opened read-only - reopen for cache writes
+    close_db()
+    cache_repo = CacheRepository(read_only=False)
+
+    cached_terms = cache_repo.cached_terms()
+    pending = []
     for term_id in terms:
         if term_id not in terms_with_voting:
             logger.info("Skipping term {} (no voting data)", term_id)
@@ -98,16 +110,40 @@ def precompute_analytics(terms: list[int] | None = None, force: bool = False):
         if force:
             cache_repo.clear(term_id)
 
-        if cache_repo.exists(term_id) and not force:
+        if term_id in cached_terms and not force:
             logger.info("Term {}: analytics already cached", term_id)
             continue
 
-        analytics.precompute_all(term_id)
-
+        pending.append(term_id)
+
+    if pending:
+        # Release the write lock so workers can open the DB read-only
+        close_db()
+
+        # CPU-bound and independent per term - bypass the GIL with processes
+        workers = min(PRECOMPUTE_WORKERS, len(pending))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            results = list(pool.map(_compute_term, pending))
+
+        cache_repo = CacheRepository(read_only=False)
+        mp_writer, voting_writer = MpRepository(read_only=False), VotingRepository(read_only=False)
+        process_writer = ProcessRepository(read_only=False)
+        for term_id, data in zip(pending, results):
+            cache_repo.set_many(term_id, data)
+            # Persist the term-level query results the app would otherwise rerun after each restart
+            mp_writer.get_parties(term_id)
+            voting_writer.get_vote_sequences(term_id)
+            process_writer.get_process_stats(term_id)
+            TopicModeling(process_writer).analyze_topics(term_id)
+            logger.info("All analytics cached for term {}", term_id)
+
+    close_db()
     logger.info("Analytics precomputation complete!")
 
 
 def main():
+    # Here rather than at import: spawned precompute workers re-import this module and must not add file sinks
+    setup_logging(level="INFO", to_file=True)
     args = sys.argv[1:]
 
     if "--validate" in args or args == ["validate"]:
@@ -1,5 +1,7 @@
 """Tests for formulas module."""
 
+import numpy as np
+
 from helpers import formulas
 
 
@@ -15,6 +17,21 @@ class TestShapley:
         result = formulas.shapley_shubik({"A": 40, "B": 30, "C": 30}, 51)
         assert abs(sum(result.values()) - 1.0) < 0.001
 
+    def test_known_values(self):
+        result = formulas.shapley_shubik({"A": 50, "B": 49, "C": 1}, 51)
+        assert abs(result["A"] - 2 / 3) < 1e-9
+        assert abs(result["B"] - 1 / 6) < 1e-9
+        assert abs(result["C"] - 1 / 6) < 1e-9
+
+    def test_dummy_party(self):
+        result = formulas.shapley_shubik({"A": 60, "B": 30, "C": 10}, 51)
+        assert result == {"A": 1.0, "B": 0.0, "C": 0.0}
+
+    def test_many_parties(self):
+        seats = dict(zip("ABCDEFGHIJKLMNO", [157, 148, 65, 32, 26, 16, 12, 4, 1, 1, 1, 1, 1, 1, 1]))
+        result = formulas.shapley_shubik(seats, 231)
+        assert abs(sum(result.values()) - 1.0) < 1e-9
+
 
 class TestBanzhaf:
     def test_single_party(self):
@@ -24,6 +41,12 @@ class TestBanzhaf:
         result = formulas.banzhaf({"A": 40, "B": 30, "C": 30}, 51)
         assert abs(sum(result.values()) - 1.0) < 0.001
 
+    def test_known_values(self):
+        result = formulas.banzhaf({"A": 50, "B": 49, "C": 1}, 51)
+        assert abs(result["A"] - 0.6) < 1e-9
+        assert abs(result["B"] - 0.2) < 1e-9
+        assert abs(result["C"] - 0.2) < 1e-9
+
 
 class TestCoalitions:
     def test_finds_coalitions(self):
@@ -31,6 +54,10 @@ class TestCoalitions:
         assert len(result) > 0
         assert all(c[1] >= 51 for c in result)
 
+    def test_only_minimal(self):
+        result = formulas.min_coalitions({"A": 45, "B": 40, "C": 10, "D": 5}, 51)
+        assert [c[0] for c in result] == [frozenset("AC"), frozenset("BCD"), frozenset("AB")]
+
 
 class TestRice:
     def test_unanimous_yes(self):
@@ -45,6 +72,22 @@ class TestRice:
     def test_skewed(self):
         assert formulas.rice_index(75, 25) == 0.5
 
+    def test_average_vec_matches_scalar(self):
+        votes = [(100, 0), (50, 50), (75, 25), (0, 0)]
+        assert abs(formulas.average_rice_vec(np.array(votes)) - formulas.average_rice(votes)) < 1e-12
+
+    def test_average_vec_empty(self):
+        assert formulas.average_rice_vec(np.empty((0, 2))) == 0.0
+
+    def test_average_rice_grouped(self):
+        yn = np.array([(100, 0), (50, 50), (75, 25), (10, 30), (0, 0)])
+        groups = np.array([0, 1, 0, 1, 0])
+        avg, counts = formulas.average_rice_grouped(yn, groups, 3)
+        assert counts.tolist() == [3, 2, 0]
+        for g in range(2):
+            assert abs(avg[g] - formulas.average_rice_vec(yn[groups == g])) < 1e-12
+        assert avg[2] == 0.0
+
 
 class TestMarkov:
     def test_consistent_yes(self):
@@ -57,6 +100,21 @@ class TestMarkov:
         assert trans["yes_to_no"] == 1.0
         assert trans["no_to_yes"] == 1.0
 
+    def test_stats_match_matrix(self):
+        seq = ["YES", "YES", "NO", "ABSENT", "YES", "NO", "NO", "NO", "YES"]
+        stats = formulas.transition_stats(seq)
+        trans = formulas.transition_matrix(seq)
+        assert all(stats[k] == v for k, v in trans.items())
+        assert stats["momentum"] == formulas.momentum(trans)
+        assert stats["volatility"] == formulas.volatility(trans)
+
+    def test_stats_bool_sequence(self):
+        seq = ["YES", "YES", "NO", "YES", "NO", "NO", "NO", "YES"]
+        assert formulas.transition_stats([v == "YES" for v in seq]) == formulas.transition_stats(seq)
+
+    def test_stats_short_sequence(self):
+        assert formulas.transition_stats(["YES"])["momentum"] == 0
+
     def test_momentum(self):
         trans = {"yes_to_yes": 0.8, "no_to_no": 0.8, "yes_to_no": 0.2, "no_to_yes": 0.2}
         assert formulas.momentum(trans) == 0.8
@@ -75,3 +133,13 @@ class TestAgreement:
 
     def test_half(self):
         assert formulas.agreement_rate([True, False], [True, True]) == 50.0
+
+    def test_pairwise_matches_dense(self):
+        rng = np.random.default_rng(0)
+        present = rng.random((5, 203)) < 0.8
+        yes = rng.random((5, 203)) < 0.5
+        no = present & ~yes
+        both, agree = formulas.pairwise_agreement(present, yes)
+        p, y, n = present.astype(int), (present & yes).astype(int), no.astype(int)
+        assert (both == p @ p.T).all()
+        assert (agree == y @ y.T + n @ n.T).all()
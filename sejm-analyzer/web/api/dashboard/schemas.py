@@ -1,11 +1,13 @@
 """Dashboard API response schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TermItem(BaseModel):
     """Term info."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: int
     has_voting_data: bool
     has_processes: bool
@@ -14,6 +16,8 @@ class TermItem(BaseModel):
 class TermsResponse(BaseModel):
     """Available terms response."""
 
+    model_config = ConfigDict(frozen=True)
+
     items: list[TermItem]
     current: int | None
 
@@ -21,6 +25,8 @@ class TermsResponse(BaseModel):
 class OverviewResponse(BaseModel):
     """Dashboard overview response."""
 
+    model_config = ConfigDict(frozen=True)
+
     term_id: int
     parties_count: int
     total_seats: int
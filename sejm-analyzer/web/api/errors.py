@@ -20,9 +20,11 @@ class ValidationError(Exception):
 # Valid term range (Polish Sejm)
 MIN_TERM = 1
 MAX_TERM = 15
+# Membership test: one hash lookup per request instead of a chained comparison
+_VALID_TERMS = frozenset(range(MIN_TERM, MAX_TERM + 1))
 
 
 def validate_term_id(term_id: int) -> None:
     """Validate term_id is in valid range."""
-    if not MIN_TERM <= term_id <= MAX_TERM:
+    if term_id not in _VALID_TERMS:
         raise ValidationError(f"Invalid term_id: {term_id}. Must be between {MIN_TERM} and {MAX_TERM}")
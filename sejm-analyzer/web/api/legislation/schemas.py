@@ -1,11 +1,13 @@
 """Legislation API response schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TopicClusterItem(BaseModel):
     """Topic cluster stats."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     count: int
     pass_rate: float
@@ -15,6 +17,8 @@ class TopicClusterItem(BaseModel):
 class TopicStatsResponse(BaseModel):
     """Topic statistics response."""
 
+    model_config = ConfigDict(frozen=True)
+
     term_id: int
     total_topics: int
     clusters: list[TopicClusterItem]
@@ -23,6 +27,8 @@ class TopicStatsResponse(BaseModel):
 class ByTypeItem(BaseModel):
     """Stats by document type."""
 
+    model_config = ConfigDict(frozen=True)
+
     type: str | None
     total: int
     passed: int
@@ -31,6 +37,8 @@ class ByTypeItem(BaseModel):
 class ProcessStatsResponse(BaseModel):
     """Process statistics response."""
 
+    model_config = ConfigDict(frozen=True)
+
     term_id: int
     total: int
     passed: int
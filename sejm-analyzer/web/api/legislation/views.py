@@ -3,12 +3,7 @@
 from app.container import container
 from web.api.errors import validate_term_id
 
-from .schemas import (
-    ByTypeItem,
-    ProcessStatsResponse,
-    TopicClusterItem,
-    TopicStatsResponse,
-)
+from .schemas import ByTypeItem, ProcessStatsResponse, TopicClusterItem, TopicStatsResponse
 
 
 def get_topic_stats(term_id: int) -> TopicStatsResponse:
@@ -16,46 +11,26 @@ def get_topic_stats(term_id: int) -> TopicStatsResponse:
     validate_term_id(term_id)
     data = container.topic_modeling.get_topic_stats(term_id)
 
-    clusters = [
-        TopicClusterItem(
-            name=c["name"],
-            count=c["count"],
-            pass_rate=c["pass_rate"],
-            keywords=c["keywords"],
-        )
-        for c in data["clusters"]
-    ]
-
-    return TopicStatsResponse(
-        term_id=term_id,
-        total_topics=data["total_topics"],
-        clusters=clusters,
-    )
+    # Service output is already typed: skip validation
+    clusters = [TopicClusterItem.model_construct(**c) for c in data["clusters"]]
 
+    return TopicStatsResponse.model_construct(term_id=term_id, total_topics=data["total_topics"], clusters=clusters)
 
-def get_process_stats(term_id: int) -> ProcessStatsResponse:
-    """Get process statistics."""
+
+def get_process_stats(term_id: int, limit: int = 10) -> ProcessStatsResponse:
+    """Get process statistics, with the `limit` most common document types."""
     validate_term_id(term_id)
     data = container.legislation_analytics.repo.get_process_stats(term_id)
 
-    by_type = [
-        ByTypeItem(
-            type=item["type"],
-            total=item["total"],
-            passed=item["passed"],
-        )
-        for item in data["by_type"]
-    ]
-
     total = data["total"]
     passed = data["passed"]
     pass_rate = round(passed / total * 100, 1) if total else 0
 
-    return ProcessStatsResponse(
+    return ProcessStatsResponse.model_construct(
         term_id=term_id,
         total=total,
         passed=passed,
         rejected=data["rejected"],
         pass_rate=pass_rate,
-        by_type=by_type,
+        by_type=[ByTypeItem.model_construct(**item) for item in data["by_type"][:limit]],
     )
@@ -72,4 +72,5 @@ class AgreementMatrixResponse(BaseModel):
 
     term_id: int
     parties: list[str]
-    matrix: dict[str, dict[str, float]]
+    # matrix[i][j]: agreement (%) of parties[i] with parties[j]
+    matrix: list[list[float]]
@@ -21,8 +21,9 @@ def get_power_indices(term_id: int) -> PowerIndicesResponse:
     validate_term_id(term_id)
     data = container.voting_analytics.power_indices(term_id)
 
+    # Analytics output is already typed: skip validation
     items = [
-        PowerIndexItem(
+        PowerIndexItem.model_construct(
             party=p.party,
             seats=p.seats,
             seats_pct=p.seats_pct,
@@ -32,7 +33,7 @@ def get_power_indices(term_id: int) -> PowerIndicesResponse:
         for p in data
     ]
 
-    return PowerIndicesResponse(
+    return PowerIndicesResponse.model_construct(
         term_id=term_id,
         items=items,
         total_seats=sum(p.seats for p in data),
@@ -45,7 +46,7 @@ def get_cohesion(term_id: int) -> CohesionResponse:
     data = container.voting_analytics.cohesion(term_id)
 
     items = [
-        CohesionItem(
+        CohesionItem.model_construct(
             party=p.party,
             rice_index=p.rice_index,
             votings=p.votings,
@@ -53,7 +54,7 @@ def get_cohesion(term_id: int) -> CohesionResponse:
         for p in data
     ]
 
-    return CohesionResponse(term_id=term_id, items=items)
+    return CohesionResponse.model_construct(term_id=term_id, items=items)
 
 
 def get_markov(term_id: int) -> MarkovResponse:
@@ -61,38 +62,26 @@ def get_markov(term_id: int) -> MarkovResponse:
     validate_term_id(term_id)
     data = container.voting_analytics.markov(term_id)
 
-    items = [
-        MarkovItem(
-            party=d["party"],
-            momentum=d["momentum"],
-            volatility=d["volatility"],
-        )
-        for d in data
-    ]
+    items = [MarkovItem.model_construct(**d) for d in data]
+
+    return MarkovResponse.model_construct(term_id=term_id, items=items)
 
-    return MarkovResponse(term_id=term_id, items=items)
 
+def get_coalitions(term_id: int, total_seats: int | None = None) -> CoalitionsResponse:
+    """Get minimum winning coalitions.
 
-def get_coalitions(term_id: int) -> CoalitionsResponse:
-    """Get minimum winning coalitions."""
+    Pass `total_seats` (e.g. from a power indices response) to skip looking it up.
+    """
     validate_term_id(term_id)
     data = container.voting_analytics.coalitions(term_id)
 
-    # Get quota from power indices calculation
-    power = container.voting_analytics.power_indices(term_id)
-    total_seats = sum(p.seats for p in power)
+    if total_seats is None:
+        total_seats = container.voting_analytics.total_seats(term_id)
     quota = total_seats // 2 + 1
 
-    items = [
-        CoalitionItem(
-            parties=d["parties"],
-            seats=d["seats"],
-            surplus=d["surplus"],
-        )
-        for d in data
-    ]
+    items = [CoalitionItem.model_construct(**d) for d in data]
 
-    return CoalitionsResponse(term_id=term_id, quota=quota, items=items)
+    return CoalitionsResponse.model_construct(term_id=term_id, quota=quota, items=items)
 
 
 def get_agreement_matrix(term_id: int) -> AgreementMatrixResponse:
@@ -102,8 +91,8 @@ def get_agreement_matrix(term_id: int) -> AgreementMatrixResponse:
 
     parties = list(data.keys())
 
-    return AgreementMatrixResponse(
+    return AgreementMatrixResponse.model_construct(
         term_id=term_id,
         parties=parties,
-        matrix=data,
+        matrix=[[row.get(p, 0.0) for p in parties] for row in data.values()],
     )
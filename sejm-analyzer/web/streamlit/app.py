@@ -1,21 +1,34 @@
 """Sejm Analyzer Dashboard."""
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to path (for streamlit which runs this file directly)
 _root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(_root))
 
+import numpy as np  # noqa: E402
 import plotly.graph_objects as go  # noqa: E402
+import plotly.io as pio  # noqa: E402
 import streamlit as st  # noqa: E402
 from loguru import logger  # noqa: E402
 
-from app.container import container  # noqa: E402
+from app.container import Container, container  # noqa: E402
 from web.api import dashboard, legislation, voting  # noqa: E402
 
-# Ensure container is initialized
-container.init()
+
+@st.cache_resource
+def init_container() -> Container:
+    """Initialize the DI container once per server process instead of on every rerun."""
+    container.init()
+    return container
+
+
+init_container()
+
+# Serialize figures with orjson instead of stdlib json (much faster for heatmaps)
+pio.json.config.default_engine = "orjson"
 
 st.set_page_config(page_title="Sejm Analyzer", page_icon="🏛️", layout="wide")
 
@@ -32,7 +45,11 @@ COLORS = {
     "Polska2050-TD": "#6366F1",
 }
 
+# Above this many parties the agreement heatmap is drawn without per-cell labels
+HEATMAP_TEXT_MAX_PARTIES = 12
+
 
+@lru_cache(maxsize=64)
 def color(name: str) -> str:
     return COLORS.get(name, "#6B7280")
 
@@ -53,7 +70,7 @@ def get_term_data(term_id: int):
     has_voting = terms_info.get(term_id, {}).get("voting", False)
 
     power_resp = voting.get_power_indices(term_id)
-    coalitions_resp = voting.get_coalitions(term_id)
+    coalitions_resp = voting.get_coalitions(term_id, total_seats=power_resp.total_seats)
     cohesion_resp = voting.get_cohesion(term_id)
     agreement_resp = voting.get_agreement_matrix(term_id)
 
@@ -61,7 +78,10 @@ def get_term_data(term_id: int):
         "power": [p.model_dump() for p in power_resp.items],
         "coalitions": [c.model_dump() for c in coalitions_resp.items],
         "cohesion": [c.model_dump() for c in cohesion_resp.items],
-        "agreement": agreement_resp.matrix,
+        "agreement": {"parties": agreement_resp.parties, "matrix": agreement_resp.matrix},
+        # Bar colors in each list's own order, resolved once per term rather than per chart render
+        "power_colors": [color(p.party) for p in power_resp.items],
+        "cohesion_colors": [color(c.party) for c in cohesion_resp.items],
         "has_voting_data": has_voting,
     }
 
@@ -79,18 +99,30 @@ def get_available_terms():
     return [t.id for t in terms_resp.items] if terms_resp.items else [10, 9, 8, 7]
 
 
-@st.cache_data(ttl=3600, show_spinner="Analyzing topics...")
-def get_topic_data(term_id: int):
+@st.cache_data(ttl=300, show_spinner=False)
+def get_legislation_version(term_id: int) -> str:
+    """Stamp of the term's process data - part of the disk cache keys below."""
+    return container.legislation_analytics.data_version(term_id)
+
+
+# Persisted to disk (survives restarts); Streamlit ignores TTL for persisted caches, so callers
+# pass `data_version` - a sync that adds processes changes the key instead of serving stale results
+@st.cache_data(max_entries=8, persist="disk", show_spinner="Analyzing topics...")
+def get_topic_data(term_id: int, data_version: str):
     """Get topic modeling results via views."""
     resp = legislation.get_topic_stats(term_id)
+    clusters = [c.model_dump() for c in resp.clusters]
+    # Pre-bake expander labels once, cached with the data
+    for c in clusters:
+        c["label"] = f"**{c['name']}** — {c['count']} processes ({c['pass_rate']:.0f}% pass rate)"
     return {
         "total_topics": resp.total_topics,
-        "clusters": [c.model_dump() for c in resp.clusters],
+        "clusters": clusters,
     }
 
 
-@st.cache_data(ttl=3600, show_spinner="Training model...")
-def get_prediction_model(term_id: int):
+@st.cache_data(max_entries=8, persist="disk", show_spinner="Training model...")
+def get_prediction_model(term_id: int, data_version: str):
     """Train and get prediction model stats."""
     container.legislation_analytics.train(term_id)
     eval_result = container.legislation_analytics.evaluate(term_id)
@@ -101,12 +133,27 @@ def get_prediction_model(term_id: int):
     }
 
 
-def pie_chart(power: list) -> go.Figure:
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def build_importance_fig(term_id: int, data_version: str, top_k: int = 10) -> dict:
+    """Build feature importance chart once per (term, data version, top_k); returns figure dict."""
+    importance = get_prediction_model(term_id, data_version)["model_stats"]["feature_importance"][:top_k]
+    fig = go.Figure(
+        go.Bar(
+            x=[f[1] for f in importance],
+            y=[f[0] for f in importance],
+            orientation="h",
+        )
+    )
+    fig.update_layout(height=350, margin=dict(l=150))
+    return fig.to_dict()
+
+
+def pie_chart(power: list, colors: list[str]) -> go.Figure:
     return go.Figure(
         go.Pie(
             labels=[p["party"] for p in power],
             values=[p["seats"] for p in power],
-            marker=dict(colors=[color(p["party"]) for p in power]),
+            marker=dict(colors=colors),
             hole=0.4,
             textposition="inside",
             textinfo="label+percent",
@@ -114,13 +161,14 @@ def pie_chart(power: list) -> go.Figure:
     ).update_layout(showlegend=False, margin=dict(t=20, b=20, l=20, r=20), height=350)
 
 
-def bar_chart(data: list, x_key: str, y_key: str, title: str = "") -> go.Figure:
+def bar_chart(data: list, x_key: str, y_key: str, colors: list[str], title: str = "") -> go.Figure:
+    y = np.array([d[y_key] for d in data])
     return go.Figure(
         go.Bar(
             x=[d[x_key] for d in data],
-            y=[d[y_key] for d in data],
-            marker_color=[color(d[x_key]) for d in data],
-            text=[f"{d[y_key]:.1f}" if isinstance(d[y_key], float) else d[y_key] for d in data],
+            y=y,
+            marker_color=colors,
+            text=np.char.mod("%.1f", y).tolist() if y.dtype.kind == "f" else y.tolist(),
             textposition="outside",
         )
     ).update_layout(
@@ -132,9 +180,11 @@ def bar_chart(data: list, x_key: str, y_key: str, title: str = "") -> go.Figure:
     )
 
 
-def heatmap_chart(matrix: dict, title: str = "") -> go.Figure:
-    parties = list(matrix.keys())
-    z = [[matrix[p1].get(p2, 0) for p2 in parties] for p1 in parties]
+def heatmap_chart(parties: list[str], z: list[list[float]], title: str = "") -> go.Figure:
+    # Per-cell labels dominate render cost for large matrices - keep them for the common small case only
+    labels = {}
+    if len(parties) <= HEATMAP_TEXT_MAX_PARTIES:
+        labels = dict(text=[[f"{v:.0f}%" for v in row] for row in z], texttemplate="%{text}", textfont={"size": 10})
 
     return go.Figure(
         go.Heatmap(
@@ -144,9 +194,7 @@ def heatmap_chart(matrix: dict, title: str = "") -> go.Figure:
             colorscale="RdYlGn",
             zmin=0,
             zmax=100,
-            text=[[f"{v:.0f}%" for v in row] for row in z],
-            texttemplate="%{text}",
-            textfont={"size": 10},
+            **labels,
         )
     ).update_layout(
         title=title,
@@ -155,8 +203,11 @@ def heatmap_chart(matrix: dict, title: str = "") -> go.Figure:
     )
 
 
-def voting_tab(term_id: int, data: dict):
+def voting_tab(term_id: int):
     """Voting analytics tab."""
+    with st.spinner("Loading data..."):
+        data = get_term_data(term_id)
+
     if not data["has_voting_data"]:
         st.warning(f"Term {term_id} doesn't have voting data synced yet.")
         return
@@ -175,11 +226,11 @@ def voting_tab(term_id: int, data: dict):
 
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(pie_chart(power), width="stretch")
+        st.plotly_chart(pie_chart(power, data["power_colors"]), width="stretch")
 
     with col2:
         st.plotly_chart(
-            bar_chart(power, "party", "shapley", "Shapley-Shubik Power Index (%)"),
+            bar_chart(power, "party", "shapley", data["power_colors"], "Shapley-Shubik Power Index (%)"),
             width="stretch",
         )
 
@@ -198,30 +249,30 @@ def voting_tab(term_id: int, data: dict):
     if cohesion:
         st.subheader("🤝 Party Cohesion (Rice Index)")
         st.plotly_chart(
-            bar_chart(cohesion, "party", "rice_index", "Party Discipline (1.0 = unanimous)"),
+            bar_chart(cohesion, "party", "rice_index", data["cohesion_colors"], "Party Discipline (1.0 = unanimous)"),
             width="stretch",
         )
 
     # Coalitions
     if coalitions:
         st.subheader("🤝 Minimum Winning Coalitions")
-        for i, c in enumerate(coalitions[:5]):
-            parties_str = " + ".join(c["parties"])
-            st.write(f"{i + 1}. **{parties_str}** — {c['seats']} seats (surplus: {c['surplus']})")
+        lines = [
+            f"{i}. **{' + '.join(c['parties'])}** — {c['seats']} seats (surplus: {c['surplus']})"
+            for i, c in enumerate(coalitions[:5], 1)
+        ]
+        st.markdown("\n".join(lines))
 
     # Agreement matrix
-    if agreement:
+    if agreement["parties"]:
         st.subheader("🔄 Party Agreement Matrix")
-        st.plotly_chart(heatmap_chart(agreement, "How often parties vote together (%)"), width="stretch")
+        st.plotly_chart(
+            heatmap_chart(agreement["parties"], agreement["matrix"], "How often parties vote together (%)"),
+            width="stretch",
+        )
 
 
 def legislation_tab(term_id: int):
     """Legislation analytics tab."""
-    terms_info = get_terms_info()
-    if not terms_info.get(term_id, {}).get("processes", False):
-        st.warning(f"Term {term_id} doesn't have legislation data synced yet.")
-        return
-
     data = get_processes_data(term_id)
     stats = data["stats"]
     processes = data["processes"]
@@ -248,7 +299,7 @@ def legislation_tab(term_id: int):
     if stats["by_type"]:
         st.subheader("📊 By Document Type")
         type_data = [
-            {"type": t["type"] or "Unknown", "count": t["total"], "passed": t["passed"]} for t in stats["by_type"][:10]
+            {"type": t["type"] or "Unknown", "count": t["total"], "passed": t["passed"]} for t in stats["by_type"]
         ]
 
         fig = go.Figure(
@@ -263,12 +314,7 @@ def legislation_tab(term_id: int):
 
 def topics_tab(term_id: int):
     """Topic modeling tab."""
-    terms_info = get_terms_info()
-    if not terms_info.get(term_id, {}).get("processes", False):
-        st.warning(f"Term {term_id} doesn't have legislation data.")
-        return
-
-    topics = get_topic_data(term_id)
+    topics = get_topic_data(term_id, get_legislation_version(term_id))
 
     if not topics["clusters"]:
         st.info("No topic data available.")
@@ -277,20 +323,14 @@ def topics_tab(term_id: int):
     st.subheader(f"🏷️ {topics['total_topics']} Topics Identified")
 
     for cluster in topics["clusters"]:
-        with st.expander(
-            f"**{cluster['name']}** — {cluster['count']} processes ({cluster['pass_rate']:.0f}% pass rate)"
-        ):
+        with st.expander(cluster["label"]):
             st.write("**Keywords:** " + ", ".join(cluster["keywords"]))
 
 
 def prediction_tab(term_id: int):
     """ML prediction tab."""
-    terms_info = get_terms_info()
-    if not terms_info.get(term_id, {}).get("processes", False):
-        st.warning(f"Term {term_id} doesn't have legislation data.")
-        return
-
-    model_data = get_prediction_model(term_id)
+    data_version = get_legislation_version(term_id)
+    model_data = get_prediction_model(term_id, data_version)
     evaluation = model_data["evaluation"]
     model_stats = model_data["model_stats"]
 
@@ -308,16 +348,17 @@ def prediction_tab(term_id: int):
 
     if model_stats.get("feature_importance"):
         st.subheader("📊 Feature Importance")
-        importance = model_stats["feature_importance"][:10]
-        fig = go.Figure(
-            go.Bar(
-                x=[f[1] for f in importance],
-                y=[f[0] for f in importance],
-                orientation="h",
-            )
-        )
-        fig.update_layout(height=350, margin=dict(l=150))
-        st.plotly_chart(fig, width="stretch")
+        st.plotly_chart(go.Figure(build_importance_fig(term_id, data_version)), width="stretch")
+
+
+# Tab dispatch: (label, renderer, requires legislation data).
+# main() checks the requirement once per run, so the renderers don't re-check it.
+TABS = [
+    ("🗳️ Voting", voting_tab, False),
+    ("📜 Legislation", legislation_tab, True),
+    ("🏷️ Topics", topics_tab, True),
+    ("🤖 Prediction", prediction_tab, True),
+]
 
 
 def main():
@@ -328,24 +369,13 @@ def main():
     terms = get_available_terms()
     term_id = st.sidebar.selectbox("Select Term (Kadencja)", terms, index=0)
 
-    # Load data
-    with st.spinner("Loading data..."):
-        data = get_term_data(term_id)
-
-    # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["🗳️ Voting", "📜 Legislation", "🏷️ Topics", "🤖 Prediction"])
-
-    with tab1:
-        voting_tab(term_id, data)
-
-    with tab2:
-        legislation_tab(term_id)
-
-    with tab3:
-        topics_tab(term_id)
+    # Tabs (legislation tabs only when the term has process data)
+    has_processes = get_terms_info().get(term_id, {}).get("processes", False)
+    tabs = [(label, render) for label, render, needs_processes in TABS if has_processes or not needs_processes]
 
-    with tab4:
-        prediction_tab(term_id)
+    for tab, (_, render) in zip(st.tabs([label for label, _ in tabs]), tabs):
+        with tab:
+            render(term_id)
 
     # Footer
     st.sidebar.markdown("---")